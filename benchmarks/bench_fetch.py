@@ -0,0 +1,48 @@
+"""
+Micro-benchmark of the client-side cost of Resource.fetch_resource, with the
+transport replaced by an in-memory adapter so only octokit.py's own CPU time
+is measured: URI template expansion, request preparation, hooks and parsing.
+
+    python -m benchmarks.bench_fetch
+"""
+
+import timeit
+
+import uritemplate
+
+import octokit
+from octokit.utils import compile_template
+
+from . import util
+
+TEMPLATE = 'mock://api.github.com/repos{/owner}{/repo}'
+VARIABLES = {'owner': 'octokit', 'repo': 'octokit.py'}
+
+
+def uncached_template():
+    uritemplate.variables(TEMPLATE)
+    uritemplate.expand(TEMPLATE, VARIABLES)
+
+
+def cached_template():
+    template = compile_template(TEMPLATE)
+    template.variable_names
+    template.expand(VARIABLES)
+
+
+def main(number=5000):
+    session = util.session(default={'id': 1, 'name': 'octokit.py'})
+    client = octokit.Client(api_endpoint=TEMPLATE, session=session)
+
+    cases = [
+        ('template, uncached', uncached_template),
+        ('template, compiled', cached_template),
+        ('fetch_resource', lambda: client.get(**VARIABLES)),
+    ]
+    for label, func in cases:
+        seconds = timeit.timeit(func, number=number)
+        print('%-20s %8.1f us/call' % (label, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark of the memory held by large paginated result sets.
+
+Fetches a listing of 50 pages of 100 issues from an in-memory transport,
+keeps every page and reads one field of every issue, then reports the
+memory still allocated according to tracemalloc.
+
+    python -m benchmarks.bench_memory
+"""
+
+import gc
+import tracemalloc
+
+import octokit
+
+from . import util
+
+PAGES = 50
+PER_PAGE = 100
+
+
+def retained(keep_response):
+    """Return the bytes retained by the pages of the listing"""
+    url = 'mock://api.github.com/repos/octokit/octokit.py/issues'
+    session = util.listing_session(url, PAGES, PER_PAGE)
+    session.keep_response = keep_response
+    client = octokit.Client(api_endpoint=url, session=session)
+
+    gc.collect()
+    tracemalloc.start()
+    pages = list(client.iter_pages())
+    numbers = [issue['number'] for page in pages for issue in page.schema]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(numbers) == PAGES * PER_PAGE
+    return size
+
+
+def main():
+    print('%d pages of %d issues' % (PAGES, PER_PAGE))
+    for keep_response in (True, False):
+        print('keep_response=%-5s %10.1f KiB retained' % (
+            keep_response, retained(keep_response) / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
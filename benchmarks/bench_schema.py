@@ -0,0 +1,87 @@
+"""
+Benchmark of schema parsing on large list and object responses.
+
+Compares the lazy schema of Resource.parse_schema with the eager parsing it
+replaced, reproduced below, when only a couple of fields are read.
+
+    python -m benchmarks.bench_schema
+"""
+
+import timeit
+import tracemalloc
+
+from inflection import humanize, singularize
+
+from octokit.resources import Resource
+
+from . import payloads
+
+
+def eager_parse(data, name):
+    """The eager schema parsing Resource used to do on every response"""
+    if type(data) == list:
+        return [
+            Resource(None, schema=item, name=humanize(singularize(name)))
+            for item in data
+        ]
+
+    schema = {}
+    for key in data:
+        child = key.split('_url')[0]
+        if key.endswith('_url'):
+            schema[child] = (Resource(None, url=data[key],
+                                      name=humanize(child))
+                             if data[key] else data[key])
+        elif type(data[key]) == dict:
+            schema[child] = Resource(None, schema=data[key],
+                                     name=humanize(child))
+        elif type(data[key]) == list:
+            schema[child] = eager_parse(data[key], child)
+        else:
+            schema[child] = data[key]
+    return schema
+
+
+def lazy_parse(data, name):
+    return Resource(None, name=name).parse_schema(data)
+
+
+def read_list(schema):
+    """Read two fields of every item, like a typical listing job does"""
+    return [(item['number'], item['state']) for item in schema]
+
+
+def read_object(schema):
+    return schema['number'], schema['user']['login']
+
+
+def measure(parse, read, data, name, number):
+    """Return the time per call in microseconds and the peak allocation"""
+    seconds = timeit.timeit(lambda: read(parse(data, name)), number=number)
+
+    tracemalloc.start()
+    read(parse(data, name))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return seconds / number * 1e6, peak
+
+
+def main():
+    cases = [
+        ('list of 100 issues', payloads.issues(100), 'issues', read_list, 200),
+        ('list of 1000 issues', payloads.issues(1000), 'issues', read_list,
+         20),
+        ('single issue', payloads.issue(1), 'issue', read_object, 5000),
+    ]
+
+    print('%-22s %-6s %12s %12s' % ('case', 'parse', 'us/call', 'peak KiB'))
+    for label, data, name, read, number in cases:
+        for parser in (eager_parse, lazy_parse):
+            elapsed, peak = measure(parser, read, data, name, number)
+            print('%-22s %-6s %12.1f %12.1f' % (
+                label, parser.__name__.split('_')[0], elapsed, peak / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
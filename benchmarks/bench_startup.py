@@ -0,0 +1,75 @@
+"""
+Benchmark of the startup of a short-lived process, each measurement running
+in a fresh interpreter:
+
+- importing octokit, then accessing octokit.Client, which imports the
+  client and its dependencies;
+- building a client and making its first call, replayed from the cassette
+  of TestApi.test_user with a simulated round-trip time per request, with
+  the bundled root link map and with the links discovered by requesting
+  the API root.
+
+    python -m benchmarks.bench_startup [rtt_ms]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = '''
+import json, time
+start = time.perf_counter()
+import octokit
+imported = time.perf_counter()
+octokit.Client
+print(json.dumps([imported - start, time.perf_counter() - imported]))
+'''
+
+FIRST_CALL_SCRIPT = '''
+import json, time
+import octokit
+from benchmarks import util
+recorder = util.cassette('TestApi.test_user')
+recorder.start()
+requests = []
+
+def round_trip(response, **kwargs):
+    requests.append(response.url)
+    time.sleep(%(rtt)f)
+
+recorder.session.hooks['response'].append(round_trip)
+start = time.perf_counter()
+client = octokit.Client(session=recorder.session, root_links=%(root_links)s)
+client.user('api-padawan').login
+print(json.dumps([time.perf_counter() - start, len(requests)]))
+'''
+
+
+def run(script, repeat):
+    """Run script in fresh interpreters, returning the outputs of each run"""
+    return [
+        json.loads(subprocess.check_output(
+            [sys.executable, '-c', script], cwd=ROOT).decode())
+        for _ in range(repeat)
+    ]
+
+
+def main(rtt=0.05, repeat=5):
+    runs = run(IMPORT_SCRIPT, repeat)
+    print('import octokit         %8.1f ms' % (min(r[0] for r in runs) * 1e3))
+    print('octokit.Client         %8.1f ms' % (min(r[1] for r in runs) * 1e3))
+
+    print('\nfirst call, %.0f ms round trips' % (rtt * 1e3))
+    for label, root_links in (('bundled root', None),
+                              ('discovered root', False)):
+        runs = run(FIRST_CALL_SCRIPT % {'rtt': rtt, 'root_links': root_links},
+                   repeat)
+        print('%-22s %8.1f ms %4d requests' % (
+            label, min(r[0] for r in runs) * 1e3, runs[0][1]))
+
+
+if __name__ == '__main__':
+    main(*[float(arg) / 1e3 for arg in sys.argv[1:2]])
@@ -0,0 +1,140 @@
+"""
+Synthetic GitHub-shaped payloads used by the benchmarks.
+"""
+
+API = 'https://api.github.com'
+
+
+def user(login):
+    """A user object as embedded in issues, commits and events"""
+    url = '%s/users/%s' % (API, login)
+    return {
+        'login': login,
+        'id': hash(login) & 0xffffff,
+        'avatar_url': 'https://avatars.githubusercontent.com/u/1?v=3',
+        'gravatar_id': '',
+        'url': url,
+        'html_url': 'https://github.com/%s' % login,
+        'followers_url': url + '/followers',
+        'following_url': url + '/following{/other_user}',
+        'gists_url': url + '/gists{/gist_id}',
+        'starred_url': url + '/starred{/owner}{/repo}',
+        'subscriptions_url': url + '/subscriptions',
+        'organizations_url': url + '/orgs',
+        'repos_url': url + '/repos',
+        'events_url': url + '/events{/privacy}',
+        'received_events_url': url + '/received_events',
+        'type': 'User',
+        'site_admin': False,
+    }
+
+
+def issue(number, repo='octokit/octokit.py'):
+    """An issue object as returned by the issues listing"""
+    url = '%s/repos/%s/issues/%d' % (API, repo, number)
+    return {
+        'url': url,
+        'repository_url': '%s/repos/%s' % (API, repo),
+        'labels_url': url + '/labels{/name}',
+        'comments_url': url + '/comments',
+        'events_url': url + '/events',
+        'html_url': 'https://github.com/%s/issues/%d' % (repo, number),
+        'id': 100000 + number,
+        'number': number,
+        'title': 'Issue number %d' % number,
+        'user': user('user%d' % (number % 50)),
+        'labels': [
+            {'url': '%s/repos/%s/labels/bug' % (API, repo),
+             'name': 'bug', 'color': 'fc2929'},
+            {'url': '%s/repos/%s/labels/help' % (API, repo),
+             'name': 'help wanted', 'color': '159818'},
+        ],
+        'state': 'open' if number % 3 else 'closed',
+        'locked': False,
+        'assignee': None,
+        'milestone': None,
+        'comments': number % 7,
+        'created_at': '2015-11-01T12:00:00Z',
+        'updated_at': '2015-11-%02dT12:00:00Z' % (1 + number % 28),
+        'closed_at': None,
+        'body': 'Something is broken. ' * 10,
+    }
+
+
+def issues(count, start=1):
+    """A page of count issues"""
+    return [issue(number) for number in range(start, start + count)]
+
+
+def repository(name, depth=2, owner='octokit'):
+    """A repository object, whose parent and source repositories are nested
+    depth levels deep, like forks of forks"""
+    url = '%s/repos/%s/%s' % (API, owner, name)
+    repo = {
+        'id': hash(name) & 0xffffff,
+        'name': name,
+        'full_name': '%s/%s' % (owner, name),
+        'owner': user(owner),
+        'private': False,
+        'html_url': 'https://github.com/%s/%s' % (owner, name),
+        'description': 'Repository %s' % name,
+        'fork': depth > 0,
+        'url': url,
+        'forks_url': url + '/forks',
+        'keys_url': url + '/keys{/key_id}',
+        'collaborators_url': url + '/collaborators{/collaborator}',
+        'teams_url': url + '/teams',
+        'hooks_url': url + '/hooks',
+        'issue_events_url': url + '/issues/events{/number}',
+        'events_url': url + '/events',
+        'assignees_url': url + '/assignees{/user}',
+        'branches_url': url + '/branches{/branch}',
+        'tags_url': url + '/tags',
+        'blobs_url': url + '/git/blobs{/sha}',
+        'git_tags_url': url + '/git/tags{/sha}',
+        'git_refs_url': url + '/git/refs{/sha}',
+        'trees_url': url + '/git/trees{/sha}',
+        'statuses_url': url + '/statuses/{sha}',
+        'languages_url': url + '/languages',
+        'stargazers_url': url + '/stargazers',
+        'contributors_url': url + '/contributors',
+        'subscribers_url': url + '/subscribers',
+        'subscription_url': url + '/subscription',
+        'commits_url': url + '/commits{/sha}',
+        'git_commits_url': url + '/git/commits{/sha}',
+        'comments_url': url + '/comments{/number}',
+        'issue_comment_url': url + '/issues/comments{/number}',
+        'contents_url': url + '/contents/{+path}',
+        'compare_url': url + '/compare/{base}...{head}',
+        'merges_url': url + '/merges',
+        'archive_url': url + '/{archive_format}{/ref}',
+        'downloads_url': url + '/downloads',
+        'issues_url': url + '/issues{/number}',
+        'pulls_url': url + '/pulls{/number}',
+        'milestones_url': url + '/milestones{/number}',
+        'notifications_url': url + '/notifications{?since,all,participating}',
+        'labels_url': url + '/labels{/name}',
+        'releases_url': url + '/releases{/id}',
+        'created_at': '2015-10-25T20:43:49Z',
+        'updated_at': '2015-11-01T12:00:00Z',
+        'pushed_at': '2015-11-01T12:00:00Z',
+        'homepage': None,
+        'size': 1024,
+        'stargazers_count': 42,
+        'watchers_count': 42,
+        'language': 'Python',
+        'has_issues': True,
+        'has_downloads': True,
+        'has_wiki': True,
+        'has_pages': False,
+        'forks_count': 7,
+        'open_issues_count': 3,
+        'default_branch': 'master',
+        'permissions': {'admin': False, 'push': False, 'pull': True},
+        'network_count': 7,
+        'subscribers_count': 5,
+    }
+    if depth > 0:
+        repo['parent'] = repository(name, depth - 1, owner + '-upstream')
+        repo['source'] = repository(name, depth - 1, owner + '-source')
+    return repo
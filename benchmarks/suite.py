@@ -0,0 +1,280 @@
+"""
+Benchmark suite of octokit.py, compared against a stored baseline.
+
+Replays synthetic GitHub-shaped payloads and the recorded cassettes of the
+test suite through Client and Resource, fully offline, and measures for every
+case its throughput, CPU time per request and peak memory, along with the
+import time of the package:
+
+    python -m benchmarks.suite            # compare with benchmarks/baseline.json
+    python -m benchmarks.suite --update   # record a new baseline
+
+The run fails if the peak memory of a case regressed by more than the
+tolerance. Timings depend on the machine, so they are also reported relative
+to a calibration loop run in the same process, and only those relative
+timings are stored in the baseline. They fail the run too past the timing
+tolerance, which is wider as they vary by up to 40% between runs on a busy
+machine:
+
+    python -m benchmarks.suite --no-timings  # only compare peak memory
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import octokit
+
+from . import payloads, util
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+API = 'mock://api.github.com'
+
+# Whether a larger value of each metric is better
+HIGHER_IS_BETTER = {
+    'requests_per_sec': True,
+    'cpu_us_per_request': False,
+    'cpu_per_request': False,
+    'peak_kib': False,
+    'import_ms': False,
+    'import_relative': False,
+}
+
+# Metrics which don't depend on the speed of the machine, always compared
+STABLE = ('peak_kib',)
+
+# Timings relative to the calibration loop, compared unless --no-timings
+RELATIVE = ('cpu_per_request', 'import_relative')
+
+# Absolute timings, only reported and never stored in the baseline
+ABSOLUTE = ('requests_per_sec', 'cpu_us_per_request', 'import_ms')
+
+
+def large_issue_list():
+    """A single page of 1000 issues, reading a few fields of each"""
+    url = API + '/repos/octokit/octokit.py/issues'
+    session = util.session({url: (payloads.issues(1000), {})})
+    client = octokit.Client(api_endpoint=url, session=session)
+
+    def run():
+        page = client.get()
+        for issue in page.schema:
+            issue['number'], issue['user']['login'], issue['labels'][0]
+        return 1
+    return run
+
+
+def nested_repository():
+    """A repository whose forks are nested four levels deep, reading the
+    deepest owner"""
+    template = API + '/repos{/owner}{/repo}'
+    session = util.session(default=payloads.repository('octokit.py', 4))
+    client = octokit.Client(api_endpoint=template, session=session)
+
+    def run():
+        repo = client.get(owner='octokit', repo='octokit.py')
+        for _ in range(4):
+            repo = repo['parent']
+        repo['owner']['login']
+        return 1
+    return run
+
+
+def pagination_chain():
+    """A listing of 100 pages of 30 issues, iterated item by item"""
+    url = API + '/repos/octokit/octokit.py/issues'
+    session = util.listing_session(url, 100, 30)
+    client = octokit.Client(api_endpoint=url, session=session)
+
+    def run():
+        items = sum(1 for _ in client.iter_items())
+        assert items == 3000
+        return 100
+    return run
+
+
+def cassette_user():
+    """The recorded requests of TestApi.test_user: the API root, then a
+    user"""
+    recorder = util.cassette('TestApi.test_user')
+    recorder.start()
+    client = octokit.Client(session=recorder.session, root_links=False)
+
+    def run():
+        client.schema = {}  # request the API root again
+        client.user('api-padawan').login
+        return 2
+    return run
+
+
+CASES = [
+    ('large_issue_list', large_issue_list, 20),
+    ('nested_repository', nested_repository, 500),
+    ('pagination_chain', pagination_chain, 5),
+    ('cassette_user', cassette_user, 200),
+]
+
+
+def calibrate(repeat):
+    """Return the CPU time of a fixed pure Python loop, best of repeat, which
+    timings are divided by to compare them across machines"""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.process_time()
+        data = {}
+        for index in range(200000):
+            data[str(index)] = [index, {'key': index}]
+        sum(len(value) for value in data.values())
+        cpu = time.process_time() - start
+        best = cpu if best is None else min(best, cpu)
+    return best
+
+
+def measure(setup, number, repeat, calibration):
+    """Return the metrics of number runs of the case, best of repeat"""
+    run = setup()
+    run()  # warm up caches and lazy imports
+
+    best_wall, best_cpu, requests = None, None, 0
+    for _ in range(repeat):
+        gc.collect()
+        wall, cpu = time.perf_counter(), time.process_time()
+        requests = sum(run() for _ in range(number))
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        best_wall = wall if best_wall is None else min(best_wall, wall)
+        best_cpu = cpu if best_cpu is None else min(best_cpu, cpu)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'requests_per_sec': requests / best_wall,
+        'cpu_us_per_request': best_cpu / requests * 1e6,
+        'cpu_per_request': best_cpu / requests / calibration * 1e3,
+        'peak_kib': peak / 1024.0,
+    }
+
+
+def import_time(repeat, calibration):
+    """Return the time to import octokit and its client, which octokit
+    imports lazily, in a fresh interpreter, best of repeat, in
+    milliseconds"""
+    code = ('import time; start = time.perf_counter(); import octokit; '
+            'octokit.Client; print(time.perf_counter() - start)')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    times = [
+        float(subprocess.check_output([sys.executable, '-c', code], cwd=root))
+        for _ in range(repeat)
+    ]
+    return {
+        'import_ms': min(times) * 1000,
+        'import_relative': min(times) / calibration,
+    }
+
+
+def run_suite(repeat=5, cases=None):
+    """Return {case: {metric: value}} for the selected cases.
+
+    Relative timings are in thousandths of the calibration loop, the same
+    for every machine running as fast as the one the baseline comes from.
+    """
+    calibration = calibrate(repeat)
+    results = {}
+    for name, setup, number in CASES:
+        if cases and name not in cases:
+            continue
+        results[name] = measure(setup, number, repeat, calibration)
+    if not cases or 'import' in cases:
+        results['import'] = import_time(repeat, calibration)
+    return results
+
+
+def compare(results, baseline, tolerances):
+    """Return the regressions of results against baseline as a list of
+    (case, metric, baseline value, value, change) tuples, change being the
+    relative degradation. tolerances maps the compared metrics to the
+    degradation they tolerate."""
+    regressions = []
+    for case, values in sorted(results.items()):
+        for metric, value in sorted(values.items()):
+            tolerance = tolerances.get(metric)
+            if tolerance is None:
+                continue
+            expected = baseline.get(case, {}).get(metric)
+            if not expected:
+                continue
+            if HIGHER_IS_BETTER[metric]:
+                change = (expected - value) / expected
+            else:
+                change = (value - expected) / expected
+            if change > tolerance:
+                regressions.append((case, metric, expected, value, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('cases', nargs='*', help='cases to run, all by '
+                        'default: %s, import' % ', '.join(c[0] for c in CASES))
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update', action='store_true',
+                        help='store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help='relative degradation of the peak memory '
+                        'tolerated (default 0.3)')
+    parser.add_argument('--timing-tolerance', type=float, default=0.5,
+                        help='relative degradation of the timings '
+                        'tolerated (default 0.5)')
+    parser.add_argument('--no-timings', action='store_false', dest='timings',
+                        help="don't fail on regressions of the timings "
+                        'relative to the calibration loop')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.repeat, args.cases)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print('%-20s %-20s %12s %12s' % ('case', 'metric', 'baseline', 'result'))
+    for case, metrics in sorted(results.items()):
+        for metric, value in sorted(metrics.items()):
+            expected = baseline.get(case, {}).get(metric)
+            print('%-20s %-20s %12s %12.1f' % (
+                case, metric,
+                '-' if expected is None else '%.1f' % expected, value))
+
+    if args.update:
+        for case, metrics in results.items():
+            baseline[case] = {metric: value for metric, value
+                              in metrics.items() if metric not in ABSOLUTE}
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('\nBaseline written to %s' % args.baseline)
+        return 0
+
+    tolerances = dict.fromkeys(STABLE, args.tolerance)
+    if args.timings:
+        tolerances.update(dict.fromkeys(RELATIVE, args.timing_tolerance))
+    regressions = compare(results, baseline, tolerances)
+    for case, metric, expected, value, change in regressions:
+        print('REGRESSION %s %s: %.1f -> %.1f (%+.0f%%)' % (
+            case, metric, expected, value, change * 100))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
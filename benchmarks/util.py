@@ -0,0 +1,86 @@
+"""
+Offline transports for the benchmarks.
+"""
+
+import json
+import os
+
+import betamax
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+class StaticAdapter(BaseAdapter):
+    """A transport answering every request from memory, without sockets.
+
+    routes maps URLs to (body, headers) tuples; any other URL gets default.
+    """
+
+    def __init__(self, routes=None, default=None):
+        super(StaticAdapter, self).__init__()
+        self.routes = {}
+        for url, (body, headers) in (routes or {}).items():
+            self.add(url, body, headers)
+        self.default = None
+        if default is not None:
+            self.default = (json.dumps(default).encode('utf-8'), {})
+
+    def add(self, url, body, headers=None):
+        """Serve body, JSON-encoded once up front, with headers at url"""
+        self.routes[url] = (json.dumps(body).encode('utf-8'), headers or {})
+
+    def send(self, request, **kwargs):
+        content, headers = self.routes.get(request.url, self.default)
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(headers)
+        # A fresh copy, like a body read from the network would be
+        response._content = bytes(bytearray(content))
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def session(routes=None, default=None):
+    """Return a Session whose mock:// requests are answered from memory"""
+    session = requests.Session()
+    session.mount('mock://', StaticAdapter(routes, default))
+    return session
+
+
+def listing_session(url, pages, per_page):
+    """Return a Session serving a listing at url of pages pages of per_page
+    issues, linked by rel="next" """
+    from . import payloads
+
+    adapter = StaticAdapter()
+    for page in range(1, pages + 1):
+        # requests only encodes params into http(s) URLs
+        page_url = url if page == 1 else url + '?page=%d' % page
+        headers = {}
+        if page < pages:
+            headers['Link'] = '<%s?page=%d>; rel="next"' % (url, page + 1)
+        adapter.add(page_url, payloads.issues(per_page, page * per_page),
+                    headers)
+
+    listing = requests.Session()
+    listing.mount('mock://', adapter)
+    return listing
+
+
+CASSETTES = os.path.join(os.path.dirname(__file__), '..', 'tests',
+                         'cassettes')
+
+
+def cassette(name):
+    """Return a Betamax recorder replaying the cassette of the test suite with
+    the given name, any number of times and without network access. Use it as
+    a context manager around the requests of its `session`."""
+    recorder = betamax.Betamax(requests.Session(),
+                               cassette_library_dir=CASSETTES)
+    return recorder.use_cassette(name, record='none',
+                                 allow_playback_repeats=True)
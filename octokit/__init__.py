@@ -1,2 +1,38 @@
-from .client import Client
-from .resources import Resource
+import importlib
+import sys
+
+# Public classes and the modules they live in, imported on first access so
+# that importing octokit stays cheap
+_EXPORTS = {
+    'Client': 'client',
+    'Resource': 'resources',
+    'AsyncClient': 'aio',
+}
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _EXPORTS:
+            module = importlib.import_module('.' + _EXPORTS[name], __name__)
+            value = getattr(module, name)
+        elif not name.startswith('_'):
+            try:
+                value = importlib.import_module('.' + name, __name__)
+            except ModuleNotFoundError as error:
+                if error.name != '%s.%s' % (__name__, name):
+                    raise
+                raise AttributeError(
+                    'module %r has no attribute %r' % (__name__, name))
+        else:
+            raise AttributeError(
+                'module %r has no attribute %r' % (__name__, name))
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_EXPORTS))
+else:
+    from .client import Client
+    from .resources import Resource
+
+    if sys.version_info >= (3, 6):
+        from .aio import AsyncClient
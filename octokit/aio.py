@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.aio
+~~~~~~~~~~~
+
+This module contains the asyncio flavour of octokit.py. Requests are prepared
+by a regular requests Session, so authentication, headers and URI templates
+behave exactly like in the synchronous client, and sent with aiohttp. The
+responses are turned into requests.Response objects so that the schema
+parsing, exception mapping and rate limit code is shared.
+
+>>> async with octokit.AsyncClient(auth=('mastahyeti', 'oauth-token')) as c:
+...     user = await c.current_user()
+...     repos = await user.repos()
+>>> user.login
+'mastahyeti'
+"""
+
+import requests
+from requests.hooks import dispatch_hook
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .client import BaseClient
+from .pagination import page_params
+from .ratelimit import RateLimit
+from .resources import Resource
+
+
+class AsyncSession(requests.Session):
+    """A Session which prepares requests like requests does, but sends them
+    with an aiohttp ClientSession created on first use."""
+
+    def __init__(self):
+        if aiohttp is None:
+            raise ImportError('octokit.AsyncClient requires aiohttp')
+        super(AsyncSession, self).__init__()
+        self.transport = None
+
+    async def send_async(self, request):
+        """Send a PreparedRequest and return a requests.Response, after
+        dispatching the response hooks of the request."""
+        if self.transport is None:
+            self.transport = aiohttp.ClientSession()
+
+        async with self.transport.request(
+                request.method, request.url, data=request.body,
+                headers=dict(request.headers), proxy=self.proxies.get(
+                    request.url.split(':', 1)[0])) as r:
+            body = await r.read()
+
+        response = requests.Response()
+        response.status_code = r.status
+        response.reason = r.reason
+        response.headers = CaseInsensitiveDict(r.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = str(r.url)
+        response.request = request
+        response._content = body
+
+        return dispatch_hook('response', request.hooks, response)
+
+    async def close_async(self):
+        """Close the aiohttp ClientSession"""
+        if self.transport is not None:
+            await self.transport.close()
+            self.transport = None
+
+
+class AsyncResource(Resource):
+    """A Resource whose HTTP methods are coroutines.
+
+    Resources can't be loaded implicitly from attribute access, so await a
+    resource (`await res.get()` or `await res()`) before reading its schema.
+    """
+
+    __slots__ = ()
+
+    async def fetch_resource(self, method, *args, **kwargs):
+        """Fetch the endpoint from the API and return it as an AsyncResource.
+
+        Takes the same arguments as Resource.fetch_resource.
+        """
+        fields = kwargs.pop('fields', None)
+        prepared_req = self.prepare_request(method, *args, **kwargs)
+        response = await self.session.send_async(prepared_req)
+        return self.build_resource(response, fields)
+
+    def ensure_schema_loaded(self):
+        """Check that the resources' schema has been loaded"""
+        if not self.schema:
+            raise Exception("Await %r before accessing its schema" % self.url)
+
+    def __repr__(self):
+        if not self.schema:
+            return '<Octokit %s(%s)>' % (self.name, self.url)
+        return super(AsyncResource, self).__repr__()
+
+
+# Class of the resources built while parsing an async resource
+AsyncResource.resource_class = AsyncResource
+
+
+class AsyncPagination(object):
+    async def iter_pages(self, *args, **kwargs):
+        """Asynchronously iterate over the pages of a listing.
+
+        Takes the arguments of Pagination.iter_pages, but `cursor` and
+        `prefetch`.
+        """
+        resource = kwargs.pop('resource', None)
+        if resource is None:
+            resource = self
+        max_pages = kwargs.pop('max_pages', None)
+        fields = kwargs.get('fields')
+        kwargs['params'] = page_params(kwargs)
+
+        page = await resource.get(*args, **kwargs)
+        pages = 1
+        yield page
+
+        while ('next' in page.rels and
+               (max_pages is None or pages < max_pages) and
+               self.rate_limit.remaining != 0):
+            page = await page.rels['next'].get(fields=fields)
+            pages += 1
+            yield page
+
+    async def paginate(self, *args, **kwargs):
+        """Asynchronously iterate over the items of a listing.
+
+        Takes the arguments of iter_pages, plus `max_items`.
+        """
+        max_items = kwargs.pop('max_items', None)
+        count = 0
+        async for page in self.iter_pages(*args, **kwargs):
+            for item in page.schema:
+                if max_items is not None and count >= max_items:
+                    return
+                count += 1
+                yield item
+
+
+class AsyncBaseClient(AsyncResource, BaseClient):
+    """The asyncio counterpart of BaseClient, to be used as an async context
+    manager which loads the API root on entry and closes the connections on
+    exit."""
+
+    def __init__(self, session=None, **kwargs):
+        super(AsyncBaseClient, self).__init__(
+            session=session or AsyncSession(), **kwargs)
+
+    async def __aenter__(self):
+        await self.load()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def load(self):
+        """Load the links of the API root, from the root link map if there's
+        one"""
+        if self.root_links:
+            self.schema = self.parse_schema(self.root_links)
+        else:
+            self.schema = (await self.get()).schema
+        return self
+
+    async def close(self):
+        """Close the underlying connections"""
+        await self.session.close_async()
+
+
+class AsyncClient(AsyncPagination, RateLimit, AsyncBaseClient):
+    pass
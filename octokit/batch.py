@@ -0,0 +1,68 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Batch(object):
+    def fetch_many(self, requests, concurrency=8, resource=None,
+                   method='GET'):
+        """Fetch many resources concurrently over the session's connection
+        pool and return the results in the order of requests.
+
+        requests       - Iterable of (resource, args, kwargs) tuples, or of
+                         dictionaries of URI template variables of resource.
+        concurrency    - Maximum number of requests in flight.
+        resource       - Resource the dictionaries apply to, the client
+                         itself by default.
+        method         - HTTP method of every request.
+
+        Each result is the fetched Resource, or the exception raised while
+        fetching it. Requests wait for the rate limit to reset once it is
+        spent, through the session's scheduler if it has one.
+        """
+        if resource is None:
+            resource = self
+        calls = [self.batch_call(r, resource) for r in requests]
+        results = [None] * len(calls)
+
+        def collect(done):
+            for future in done:
+                index = pending.pop(future)
+                error = future.exception()
+                results[index] = future.result() if error is None else error
+
+        pending = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for index, (res, args, kwargs) in enumerate(calls):
+                while len(pending) >= self.batch_slots(concurrency, pending):
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                future = executor.submit(res.fetch_resource, method, *args,
+                                         **kwargs)
+                pending[future] = index
+            collect(wait(pending).done)
+
+        return results
+
+    def batch_call(self, request, resource):
+        """Normalize an item of fetch_many into (resource, args, kwargs)"""
+        if isinstance(request, dict):
+            return resource, (), dict(request)
+
+        request = tuple(request)
+        res = request[0]
+        args = tuple(request[1]) if len(request) > 1 else ()
+        kwargs = dict(request[2]) if len(request) > 2 else {}
+        return res, args, kwargs
+
+    def batch_slots(self, concurrency, pending):
+        """Return how many requests may be in flight given the rate limit,
+        waiting for it to reset if it is spent and nothing is in flight."""
+        if getattr(self.session, 'scheduler', None) is not None:
+            return concurrency
+
+        rate_limit = self.rate_limit
+        if rate_limit.remaining is None:
+            return concurrency
+        if rate_limit.remaining <= 0 and not pending:
+            time.sleep(rate_limit.resets_in or 0)
+            self.refresh_rate_limit()
+        return max(1, min(concurrency, rate_limit.remaining))
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.cache
+~~~~~~~~~~~~~
+
+This module contains the HTTP response caches octokit.py uses to make
+conditional requests. A cache is enabled by handing it to the client:
+
+>>> client = octokit.Client(cache=octokit.cache.MemoryCache())
+
+Every GET made by the client, or any resource reached from it, then carries
+`If-None-Match`/`If-Modified-Since` validators and a 304 is answered from the
+stored body. GitHub does not count 304s against the rate limit.
+"""
+
+import collections
+import json
+import sqlite3
+import threading
+
+from .utils import auth_identity
+
+# Headers restored onto a 304 response from the cached entry
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+# Marks requests whose entry wasn't read by lookup
+_UNREAD = object()
+
+
+def cache_key(request):
+    """Return the cache key of a prepared request.
+
+    The key is made of the URL, the Accept header and a digest of the
+    Authorization header, so that two tokens never share a cached body.
+    """
+    identity = auth_identity(request)
+    accept = request.headers.get('Accept', '')
+    return '%s %s %s' % (identity, accept, request.url)
+
+
+def has_validators(request):
+    """Whether a prepared request carries validators of its own"""
+    return ('If-None-Match' in request.headers or
+            'If-Modified-Since' in request.headers)
+
+
+class ValidatedEntry(object):
+    """Base class of the entries of caches, holding the validators and
+    headers stored for a single URL."""
+
+    __slots__ = ('etag', 'last_modified', 'headers')
+
+    def add_validators(self, request):
+        """Make the request conditional on this entry"""
+        if self.etag:
+            request.headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            request.headers['If-Modified-Since'] = self.last_modified
+
+
+class CacheEntry(ValidatedEntry):
+    """The validators, headers and body stored for a single URL."""
+
+    __slots__ = ('body',)
+
+    def __init__(self, etag=None, last_modified=None, headers=None, body=b''):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers or {}
+        self.body = body
+
+    @classmethod
+    def from_response(cls, response):
+        """Build an entry from a response, or None if it can't be validated"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return None
+
+        headers = {
+            k: response.headers[k] for k in CACHED_HEADERS
+            if k in response.headers
+        }
+        return cls(etag, last_modified, headers, response.content)
+
+    def restore(self, response):
+        """Turn a 304 response into the 200 response this entry stores"""
+        response.status_code = 200
+        response.reason = 'OK'
+        response._content = self.body
+        for key, value in self.headers.items():
+            response.headers.setdefault(key, value)
+        response.from_cache = True
+
+
+class Cache(object):
+    """Base class of the response caches.
+
+    Subclasses implement `get`, `set`, `delete` and `clear`; `send` holds the
+    conditional request logic shared by every backend, which builds entries
+    with `entry_from_response` and answers 304s with `not_modified`.
+    """
+
+    def lookup(self, request):
+        """Return a response to a prepared GET request served without any
+        request, or None. These caches always revalidate."""
+        return None
+
+    def get(self, key):
+        """Return the CacheEntry stored under key, or None"""
+        raise NotImplementedError
+
+    def set(self, key, entry):
+        """Store a CacheEntry under key"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Drop the entry stored under key, if any"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Drop every entry"""
+        raise NotImplementedError
+
+    def entry_from_response(self, response):
+        """Return the entry to store for a 200 response, or None"""
+        return CacheEntry.from_response(response)
+
+    def not_modified(self, key, entry, request, response):
+        """Return the response to a request answered by a 304, response,
+        from the entry stored under key"""
+        entry.restore(response)
+        return response
+
+    def send(self, session, request):
+        """Send a prepared GET request through session, conditionally if a
+        cached entry exists, and return a response carrying the full body.
+
+        Requests that already carry their own validators are sent untouched
+        so that callers can see the 304 themselves.
+        """
+        if has_validators(request):
+            return session.send(request)
+
+        key = cache_key(request)
+        # lookup may have read the entry already
+        entry = request.__dict__.pop('_octokit_entry', _UNREAD)
+        if entry is _UNREAD:
+            entry = self.get(key)
+        if entry is not None:
+            entry.add_validators(request)
+
+        response = session.send(request)
+        if response.status_code == 304 and entry is not None:
+            return self.not_modified(key, entry, request, response)
+        elif response.status_code == 200:
+            entry = self.entry_from_response(response)
+            if entry is not None:
+                self.set(key, entry)
+
+        return response
+
+
+class MemoryCache(Cache):
+    """A thread-safe, in-memory least recently used cache."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = self._entries.pop(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(Cache):
+    """A cache persisted in a SQLite database, shared across processes."""
+
+    def __init__(self, path, maxsize=None):
+        self.path = path
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,'
+                ' headers TEXT, body BLOB,'
+                ' accessed INTEGER NOT NULL DEFAULT 0)'
+            )
+            # Keeps MAX(accessed) from scanning the table on every access
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed'
+                             ' ON responses (accessed)')
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def get(self, key):
+        with self._lock, self._db:
+            row = self._db.execute(
+                'SELECT etag, last_modified, headers, body FROM responses'
+                ' WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                'UPDATE responses SET accessed ='
+                ' (SELECT MAX(accessed) + 1 FROM responses) WHERE key = ?',
+                (key,))
+
+        etag, last_modified, headers, body = row
+        return CacheEntry(etag, last_modified, json.loads(headers),
+                          bytes(body))
+
+    def set(self, key, entry):
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?,'
+                ' (SELECT COALESCE(MAX(accessed), 0) + 1 FROM responses))',
+                (key, entry.etag, entry.last_modified,
+                 json.dumps(entry.headers), sqlite3.Binary(entry.body)))
+            if self.maxsize is not None:
+                self._db.execute(
+                    'DELETE FROM responses WHERE key NOT IN'
+                    ' (SELECT key FROM responses ORDER BY accessed DESC'
+                    ' LIMIT ?)', (self.maxsize,))
+
+    def delete(self, key):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self):
+        self._db.close()
@@ -7,12 +7,14 @@ octokit.client
 This module contains the main Client class for octokit.py
 """
 
-import requests
-
+from . import root
+from .batch import Batch
+from .decoding import decode_response
 from .exceptions import handle_status
 from .pagination import Pagination
 from .ratelimit import RateLimit
 from .resources import Resource
+from .session import ConnectionPool
 
 
 class BaseClient(Resource):
@@ -28,17 +30,43 @@ class BaseClient(Resource):
     >>> client.session.proxies = {'http': 'foo.bar:3128'}
     >>> client.current_user.login
     'mastahyeti'
+
+    Each client gets a Session of its own unless one is passed as `session`.
+    An `octokit.session.ConnectionPool` passed as `pool` tunes the connection
+    pool and retries of the session, and may be shared by many clients.
+
+    A response cache from `octokit.cache` may be passed as `cache` to make
+    every GET conditional on the ETag/Last-Modified of the last response, or
+    an `octokit.store.ResponseStore` to also serve recent responses from disk.
+    Resources drop the response they were parsed from, unless `keep_response`
+    is set. An `octokit.instrumentation.Instrumentation` passed as
+    `instrumentation` publishes the timings of every request, and an
+    `octokit.coalesce.SingleFlight` passed as `coalesce` makes concurrent
+    identical GETs share a single request.
+
+    Clients of api.github.com start from the link map bundled in
+    `octokit.root` rather than requesting the API root on first use. Another
+    map, like one saved from `refresh_root`, may be passed as `root_links`,
+    or False to always request the root.
     """
 
-    def __init__(self, session=requests.Session(),
-                 api_endpoint='https://api.github.com', **kwargs):
+    def __init__(self, session=None, api_endpoint='https://api.github.com',
+                 pool=None, root_links=None, **kwargs):
+        if session is None:
+            session = (pool or ConnectionPool()).session()
+        elif pool is not None:
+            pool.mount(session)
+
         self.session = session
         self.url = api_endpoint
         self.schema = {}
         self.name = 'Client'
         self.auto_paginate = False
+        if root_links is None:
+            root_links = root.snapshot(api_endpoint)
+        self.root_links = root_links
 
-        self.session.hooks = dict(response=self.response_callback)
+        self.session.hooks['response'].append(self.response_callback)
         for key in kwargs:
             setattr(self.session, key, kwargs[key])
 
@@ -48,10 +76,31 @@ class BaseClient(Resource):
         except AttributeError:
             handle_status(404)
 
+    def ensure_schema_loaded(self):
+        """Load the schema from the root link map if there's one, otherwise
+        by requesting the API root"""
+        if not self.schema and self.root_links:
+            self.schema = self.parse_schema(self.root_links)
+        super(BaseClient, self).ensure_schema_loaded()
+
+    def refresh_root(self):
+        """Fetch the link map of the API root, use it from now on and return
+        it, for instance to be saved and passed back as `root_links`."""
+        links = self.get().schema.data
+        self.root_links = links
+        self.schema = self.parse_schema(links)
+        return links
+
     def response_callback(self, r, *args, **kwargs):
-        data = r.json() if r.text != "" else {}
-        handle_status(r.status_code, data)
+        if r.status_code < 400:
+            return
+
+        try:
+            data = decode_response(r)
+        except ValueError:
+            data = None
+        handle_status(r.status_code, data, r)
 
 
-class Client(Pagination, RateLimit, BaseClient):
+class Client(Batch, Pagination, RateLimit, BaseClient):
     pass
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.coalesce
+~~~~~~~~~~~~~~~~
+
+This module contains request coalescing. When a SingleFlight is handed to
+the client, concurrent identical GETs share a single request:
+
+>>> client = octokit.Client(coalesce=octokit.coalesce.SingleFlight())
+
+The first caller makes the request, callers asking for the same URL with
+the same headers and token while it is in flight wait for it, and all of
+them get the same Resource, or the same exception.
+"""
+
+import threading
+import time
+
+from .utils import auth_identity
+
+
+class _Call(object):
+    """A request in flight, or recently completed."""
+
+    __slots__ = ('event', 'result', 'error', 'done_at')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.done_at = None
+
+    def outcome(self):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight(object):
+    """Coalesces concurrent identical GET requests.
+
+    window         - Seconds during which the result of a completed request
+                     is still handed to identical requests, 0 to only share
+                     requests in flight. Errors are never kept.
+    clock          - Time function, replaceable for testing.
+
+    `requests` and `shared` count the requests made and the calls which
+    were answered by another call's request.
+    """
+
+    def __init__(self, window=0, clock=time.time):
+        self.window = window
+        self.clock = clock
+        self.requests = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self):
+        """The coalescing counters as a dictionary"""
+        return {'requests': self.requests, 'shared': self.shared}
+
+    def key(self, request, fields=None):
+        """Return the key under which a prepared request is coalesced"""
+        headers = tuple(sorted(
+            (k.lower(), v) for k, v in request.headers.items()
+            if k.lower() != 'authorization'
+        ))
+        return (request.url, headers, auth_identity(request),
+                None if fields is None else tuple(fields))
+
+    def _is_fresh(self, call, now):
+        if call.done_at is None:
+            return True
+        return call.error is None and now - call.done_at < self.window
+
+    def do(self, key, fetch):
+        """Return the result of fetch(), unless a call with the same key is
+        in flight or fresh, in which case its result is returned instead."""
+        now = self.clock()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and self._is_fresh(call, now):
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.requests += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            return call.outcome()
+
+        try:
+            call.result = fetch()
+        except BaseException as error:
+            call.error = error
+        finally:
+            call.done_at = self.clock()
+            with self._lock:
+                if self._calls.get(key) is call and (
+                        not self.window or call.error is not None):
+                    del self._calls[key]
+                self._sweep(call.done_at)
+            call.event.set()
+        return call.outcome()
+
+    def _sweep(self, now):
+        """Drop the completed calls which are no longer fresh"""
+        if not self.window:
+            return
+        expired = [
+            key for key, call in self._calls.items()
+            if call.done_at is not None and not self._is_fresh(call, now)
+        ]
+        for key in expired:
+            del self._calls[key]
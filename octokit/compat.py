@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.compat
+~~~~~~~~~~~~~~
+
+This module contains the fallbacks of the standard library features
+octokit.py uses which Python 2.7 or the early Python 3 releases lack.
+"""
+
+import collections
+import functools
+import multiprocessing
+import os
+import sys
+import threading
+
+PY2 = sys.version_info[0] == 2
+
+try:
+    text_type = unicode
+except NameError:
+    text_type = str
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue  # noqa: F401
+
+try:
+    from sys import intern
+except ImportError:  # Python 2, whose intern only takes byte strings
+    def intern(string, _intern=intern):
+        return _intern(string) if type(string) is str else string
+
+try:
+    from types import MappingProxyType
+except ImportError:  # Python < 3.3
+    class MappingProxyType(Mapping):
+        """A read-only view of a dictionary"""
+
+        __slots__ = ('_mapping',)
+
+        def __init__(self, mapping):
+            self._mapping = mapping
+
+        def __getitem__(self, key):
+            return self._mapping[key]
+
+        def __iter__(self):
+            return iter(self._mapping)
+
+        def __len__(self):
+            return len(self._mapping)
+
+try:
+    from functools import lru_cache
+except ImportError:  # Python 2
+    CacheInfo = collections.namedtuple(
+        'CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+    def lru_cache(maxsize=128):
+        """A bounded, thread-safe memoization of functions of positional
+        arguments. The table is emptied when full rather than evicting the
+        least recently used result."""
+        def decorator(function):
+            cache = {}
+            stats = [0, 0]
+            lock = threading.Lock()
+
+            @functools.wraps(function)
+            def wrapper(*args):
+                with lock:
+                    if args in cache:
+                        stats[0] += 1
+                        return cache[args]
+                result = function(*args)
+                with lock:
+                    stats[1] += 1
+                    if len(cache) >= maxsize:
+                        cache.clear()
+                    cache[args] = result
+                return result
+
+            def cache_info():
+                return CacheInfo(stats[0], stats[1], maxsize, len(cache))
+
+            def cache_clear():
+                with lock:
+                    cache.clear()
+                    stats[:] = [0, 0]
+
+            wrapper.cache_info = cache_info
+            wrapper.cache_clear = cache_clear
+            return wrapper
+        return decorator
+
+# Atomic on POSIX before Python 3.3, where os.rename replaces the target
+replace = getattr(os, 'replace', os.rename)
+
+
+def cpu_count():
+    """Return the number of CPUs, or None if unknown"""
+    if hasattr(os, 'cpu_count'):
+        return os.cpu_count()
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return None
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.crawl
+~~~~~~~~~~~~~
+
+This module contains the multiprocess crawl executor. Decoding and parsing
+responses is CPU bound, so large crawls are spread over worker processes,
+each with a client and connection pool of its own, pacing their requests
+on a rate limit ledger they share:
+
+>>> with octokit.crawl.CrawlExecutor(processes=8, auth=token) as crawl:
+...     for task, issue in crawl.iter_items(repos, template=ISSUES_URL):
+...         index(issue)
+
+Results come back as plain JSON values rather than Resources, which are tied
+to the session of the process that fetched them.
+"""
+
+import ctypes
+import math
+import multiprocessing
+import os
+import time
+
+from .client import Client
+from .compat import cpu_count, queue
+from .exceptions import Error
+from .scheduler import RateLimitScheduler
+
+# Fields of the budgets in the ledger, with their initial values. None is
+# stored as NaN.
+BUDGET_FIELDS = (('remaining', None), ('resets_at', None), ('retry_at', 0),
+                 ('next_slot', 0))
+
+# Size of the identities of tokens, SHA-1 hex digests
+IDENTITY_SIZE = 40
+
+# Seconds between the checks that the workers are alive while waiting for
+# results
+LIVENESS_INTERVAL = 1.0
+
+
+def get_context(context):
+    """Return the multiprocessing context of a start method name, or the
+    default one for None. Before Python 3.4 the module itself is the only
+    context, forking on POSIX."""
+    if context is not None and not isinstance(context, str):
+        return context
+    if hasattr(multiprocessing, 'get_context'):
+        return multiprocessing.get_context(context)
+    if context not in (None, 'fork' if os.name == 'posix' else 'spawn'):
+        raise ValueError('Start method %r requires Python 3.4' % context)
+    return multiprocessing
+
+
+class _SharedBudget(object):
+    """A budget of RateLimitScheduler living in the ledger's shared memory."""
+
+    __slots__ = ('_values', '_offset')
+
+    def __init__(self, values, offset):
+        self._values = values
+        self._offset = offset
+
+
+def _budget_field(index):
+    def get(self):
+        value = self._values[self._offset + index]
+        return None if math.isnan(value) else value
+
+    def set(self, value):
+        self._values[self._offset + index] = \
+            float('nan') if value is None else value
+
+    return property(get, set)
+
+
+for _index, (_name, _) in enumerate(BUDGET_FIELDS):
+    setattr(_SharedBudget, _name, _budget_field(_index))
+
+
+class _SharedBudgets(object):
+    """The table of budgets of the ledger, by token identity. Its methods are
+    called with the ledger's lock held."""
+
+    def __init__(self, context, tokens):
+        self.tokens = tokens
+        self._identities = context.RawArray(ctypes.c_char,
+                                            tokens * (IDENTITY_SIZE + 1))
+        self._values = context.RawArray(ctypes.c_double,
+                                        tokens * len(BUDGET_FIELDS))
+
+    def _identity(self, slot):
+        start = slot * (IDENTITY_SIZE + 1)
+        return self._identities[start:start + IDENTITY_SIZE + 1]
+
+    def setdefault(self, identity, default=None):
+        """Return the budget of identity, allocating it if needed"""
+        key = b'+' + identity.encode('ascii').ljust(IDENTITY_SIZE)
+        for slot in range(self.tokens):
+            used = self._identity(slot)
+            if used == key:
+                break
+            if not used.startswith(b'+'):
+                start = slot * (IDENTITY_SIZE + 1)
+                self._identities[start:start + IDENTITY_SIZE + 1] = key
+                budget = _SharedBudget(self._values,
+                                       slot * len(BUDGET_FIELDS))
+                for name, value in BUDGET_FIELDS:
+                    setattr(budget, name, value)
+                return budget
+        else:
+            raise RuntimeError('The ledger has no room for more than %d '
+                               'tokens' % self.tokens)
+        return _SharedBudget(self._values, slot * len(BUDGET_FIELDS))
+
+
+class SharedRateLimitLedger(RateLimitScheduler):
+    """A RateLimitScheduler whose budgets live in shared memory, so that the
+    processes it is handed to pace their requests together.
+
+    tokens         - Maximum number of distinct tokens tracked.
+    context        - multiprocessing context of the processes.
+
+    Takes the other arguments of RateLimitScheduler. The ledger has to reach
+    the other processes when they are started, as an argument of their
+    target or through inheritance.
+    """
+
+    def __init__(self, tokens=64, context=None, **kwargs):
+        super(SharedRateLimitLedger, self).__init__(**kwargs)
+        context = get_context(context)
+        self._budgets = _SharedBudgets(context, tokens)
+        self._lock = context.Lock()
+
+
+def _plain(resource):
+    """Return the JSON value a Resource was parsed from"""
+    schema = resource.schema
+    return getattr(schema, 'data', schema)
+
+
+def _portable(error):
+    """Return error in a form which survives pickling. Responses hold the
+    hooks of the client, so they are left behind."""
+    if isinstance(error, Error):
+        error.response = None
+        return error
+    return Error({'message': '%s: %s' % (error.__class__.__name__, error)})
+
+
+def _worker(client_kwargs, ledger, tasks, results):
+    """Main loop of the worker processes"""
+    client = Client(scheduler=ledger, **client_kwargs)
+    while True:
+        message = tasks.get()
+        if message is None:
+            return
+
+        run, index, kind, task, template, fields, max_pages = message
+        try:
+            if isinstance(task, dict):
+                resource = client.resource_class(
+                    client.session, url=template or client.url, name='Crawl')
+                variables = task
+            else:
+                resource = client.resource_class(client.session, url=task,
+                                                 name='Crawl')
+                variables = {}
+
+            if kind == 'fetch':
+                page = resource.get(fields=fields, **variables)
+                results.put((run, index, [_plain(page)], None))
+            else:
+                for page in client.iter_pages(resource=resource,
+                                              fields=fields,
+                                              max_pages=max_pages,
+                                              **variables):
+                    items = _plain(page)
+                    if not isinstance(items, list):
+                        items = [items]
+                    results.put((run, index, items, None))
+        except Exception as error:
+            results.put((run, index, None, _portable(error)))
+        else:
+            results.put((run, index, None, None))
+
+
+class CrawlExecutor(object):
+    """Runs crawls on a pool of worker processes.
+
+    processes      - Number of worker processes, one per CPU by default.
+    ledger         - SharedRateLimitLedger pacing the workers, a new one by
+                     default.
+    context        - multiprocessing context or start method name.
+    max_pending    - Number of pages of results which may wait to be
+                     consumed, after which the workers wait. 4 per process
+                     by default.
+    **kwargs       - Arguments of the Client of every worker, which must be
+                     picklable: auth, api_endpoint, headers...
+
+    Tasks are URLs, or dictionaries of variables of a URI template, and are
+    spread over the workers as they become free. Results are streamed in the
+    order they arrive, as (task, value) tuples; a task which failed yields
+    its exception as value. Iterate over the results until exhausted before
+    starting another crawl.
+
+    If a worker process dies, for instance killed for running out of
+    memory, the crawl raises a RuntimeError and the workers are stopped, to
+    be started again by the next crawl.
+
+    With the spawn start method, the default on macOS and Windows, the
+    executor must be created under `if __name__ == '__main__'`.
+    """
+
+    def __init__(self, processes=None, ledger=None, context=None,
+                 max_pending=None, **kwargs):
+        self.context = context = get_context(context)
+        self.processes = processes or cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.processes
+        if ledger is None:
+            ledger = SharedRateLimitLedger(context=context)
+        self.ledger = ledger
+        self.client_kwargs = kwargs
+        self._workers = []
+        self._tasks = None
+        self._results = None
+        self._runs = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        """Start the worker processes, if not already started"""
+        if self._workers:
+            return
+        self._tasks = self.context.Queue()
+        self._results = self.context.Queue(maxsize=self.max_pending)
+        for _ in range(self.processes):
+            worker = self.context.Process(
+                target=_worker,
+                args=(self.client_kwargs, self.ledger, self._tasks,
+                      self._results))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def close(self, timeout=None):
+        """Stop the workers once they are done with the queued tasks, whose
+        results are discarded"""
+        for _ in self._workers:
+            self._tasks.put(None)
+        deadline = None if timeout is None else time.time() + timeout
+        for worker in self._workers:
+            while worker.is_alive():
+                # Workers wait for room in the results queue to finish
+                self._discard_results()
+                wait = LIVENESS_INTERVAL / 10
+                if deadline is not None:
+                    wait = min(wait, deadline - time.time())
+                    if wait <= 0:
+                        worker.terminate()
+                        break
+                worker.join(wait)
+        self._workers = []
+
+    def _discard_results(self):
+        try:
+            while True:
+                self._results.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _get_result(self):
+        """Wait for the next result of the workers, raising a RuntimeError
+        if one of them died"""
+        while True:
+            try:
+                return self._results.get(timeout=LIVENESS_INTERVAL)
+            except queue.Empty:
+                pass
+            for worker in self._workers:
+                if not worker.is_alive():
+                    code = worker.exitcode
+                    self.close(timeout=0)
+                    raise RuntimeError('A crawl worker process died with '
+                                       'exit code %s' % code)
+
+    def fetch(self, tasks, template=None, fields=None):
+        """Fetch every task, yielding (task, value) tuples.
+
+        tasks          - Iterable of URLs or of dictionaries of variables of
+                         template.
+        template       - URI template of dictionary tasks, the API endpoint
+                         of the client by default.
+        fields         - Fields kept from the responses, see
+                         Resource.fetch_resource.
+        """
+        return self._run('fetch', tasks, template, fields, None)
+
+    def iter_items(self, tasks, template=None, fields=None, max_pages=None):
+        """Iterate over the items of every listing in tasks, yielding
+        (task, item) tuples. Takes the arguments of fetch, plus max_pages to
+        stop each listing after that many pages."""
+        return self._run('items', tasks, template, fields, max_pages)
+
+    def _run(self, kind, tasks, template, fields, max_pages):
+        self.start()
+        self._runs += 1
+        run = self._runs
+
+        tasks = list(tasks)
+        for index, task in enumerate(tasks):
+            self._tasks.put((run, index, kind, task, template, fields,
+                             max_pages))
+
+        pending = len(tasks)
+        while pending:
+            message_run, index, values, error = self._get_result()
+            if message_run != run:
+                continue  # left over from an abandoned crawl
+            if values is not None:
+                for value in values:
+                    yield tasks[index], value
+                continue
+
+            pending -= 1
+            if error is not None:
+                yield tasks[index], error
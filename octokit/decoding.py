@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.decoding
+~~~~~~~~~~~~~~~~
+
+This module decodes response bodies. Each body is decoded at most once, the
+result being shared by the exception mapping and the schema parsing, and with
+orjson when it is installed. Bodies may be projected onto a few fields right
+after decoding, dropping the rest before any schema is built.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from .compat import lru_cache
+
+# Statuses whose responses never carry a body
+BODILESS_STATUSES = (204, 304)
+
+_MISSING = object()
+
+
+def _json_loads(content):
+    return json.loads(content.decode('utf-8'))
+
+
+loads = orjson.loads if orjson is not None else _json_loads
+
+
+def set_backend(backend):
+    """Use backend, a function decoding JSON bytes, to decode responses.
+
+    Passing None restores the default backend.
+    """
+    global loads
+    if backend is None:
+        backend = orjson.loads if orjson is not None else _json_loads
+    loads = backend
+
+
+def decode_response(response):
+    """Return the decoded JSON body of response, or None if it has no body.
+
+    The result is stored on the response so that later calls are free.
+    """
+    data = getattr(response, '_octokit_data', _MISSING)
+    if data is _MISSING:
+        if response.status_code in BODILESS_STATUSES:
+            data = None
+        else:
+            content = response.content
+            data = loads(content) if content else None
+        response._octokit_data = data
+    return data
+
+
+@lru_cache(maxsize=256)
+def _field_tree(fields):
+    tree = {}
+    for field in fields:
+        node = tree
+        keys = field.split('.')
+        for key in keys[:-1]:
+            child = node.get(key, _MISSING)
+            if child is None:
+                break  # the whole value is already selected
+            if child is _MISSING:
+                child = node[key] = {}
+            node = child
+        else:
+            node[keys[-1]] = None
+    return tree
+
+
+def _project(data, tree):
+    if type(data) == list:
+        return [_project(item, tree) for item in data]
+    if type(data) != dict:
+        return data
+    return {
+        key: data[key] if subtree is None else _project(data[key], subtree)
+        for key, subtree in tree.items() if key in data
+    }
+
+
+def project(data, fields):
+    """Return decoded JSON data reduced to fields, a sequence of JSON keys or
+    dotted paths of keys, like ['number', 'user.login']. Lists, at the top
+    level or nested, have each of their items projected."""
+    return _project(data, _field_tree(tuple(fields)))
+
+
+def project_response(response, fields):
+    """Replace the decoded body of response by its projection onto fields"""
+    data = decode_response(response)
+    if data is not None:
+        response._octokit_data = project(data, fields)
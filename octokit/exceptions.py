@@ -11,6 +11,9 @@ This module contains octokit.py exceptions.
 class Error(Exception):
     """Something went wrong."""
 
+    # The response that caused the error, if any
+    response = None
+
     def __init__(self, data={'message': 'Something went wrong.'}):
         self.message = data['message']
 
@@ -97,7 +100,7 @@ STATUS_ERRORS = {
 }
 
 
-def handle_status(status, data=None):
+def handle_status(status, data=None, response=None):
     """Raise the appropriate error given a status code."""
     if status >= 400:
         error = STATUS_ERRORS.get(status)
@@ -109,4 +112,5 @@ def handle_status(status, data=None):
             else:
                 error = Error
         errorException = error(data) if data else error()
+        errorException.response = response
         raise errorException
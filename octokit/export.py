@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.export
+~~~~~~~~~~~~~~
+
+This module exports listings to columnar files. Items are read from the
+decoded JSON of each page into column buffers, without building a Resource
+per item, and written in batches so that memory stays bounded however long
+the listing is:
+
+>>> columns = octokit.export.Columns(['number', 'state', 'user.login'])
+>>> pages = client.iter_pages(resource=client.repository_issues,
+...                           owner='octokit', repo='octokit.py',
+...                           fields=columns.fields)
+>>> with octokit.export.CSVWriter('issues.csv', columns) as writer:
+...     octokit.export.export(pages, columns, writer)
+
+Batches convert to NumPy arrays or Arrow record batches when those are
+installed, and ParquetWriter writes Parquet files with pyarrow.
+"""
+
+import csv
+import io
+import json
+
+from .compat import PY2, text_type
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+_MISSING = object()
+
+
+class Columns(object):
+    """The columns of an export, as field paths into the items.
+
+    columns        - Sequence of dotted paths of JSON keys, like
+                     'user.login', which are also the names of the columns,
+                     or a list of (name, path) tuples.
+
+    Missing values are None. Paths going through a list collect the value
+    of every element of the list.
+    """
+
+    def __init__(self, columns):
+        self.names = []
+        self.paths = []
+        for column in columns:
+            name, path = column if isinstance(column, tuple) \
+                else (column, column)
+            self.names.append(name)
+            self.paths.append(tuple(path.split('.')))
+
+    @property
+    def fields(self):
+        """The paths of the columns, to be projected by iter_pages"""
+        return ['.'.join(path) for path in self.paths]
+
+    def __len__(self):
+        return len(self.names)
+
+
+def extract(item, path):
+    """Return the value at path, a tuple of keys, in decoded JSON item"""
+    value = item
+    for index, key in enumerate(path):
+        if type(value) == list:
+            return [extract(element, path[index:]) for element in value]
+        if type(value) != dict:
+            return None
+        value = value.get(key, _MISSING)
+        if value is _MISSING:
+            return None
+    return value
+
+
+def page_items(page):
+    """Return the decoded JSON items of page, a Resource or a list"""
+    schema = getattr(page, 'schema', page)
+    data = getattr(schema, 'data', schema)
+    return data if type(data) == list else [data]
+
+
+class ColumnBatch(object):
+    """A batch of rows of an export, stored as one list per column."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.values = [[] for _ in range(len(columns))]
+
+    def __len__(self):
+        return len(self.values[0]) if self.values else 0
+
+    def append(self, item):
+        """Append the row of decoded JSON item"""
+        for values, path in zip(self.values, self.columns.paths):
+            values.append(extract(item, path))
+
+    def rows(self):
+        """Return an iterator over the rows of the batch, as tuples"""
+        return zip(*self.values)
+
+    def to_numpy(self):
+        """Return the columns as a dictionary of NumPy arrays"""
+        if numpy is None:
+            raise ImportError('ColumnBatch.to_numpy requires numpy')
+        return {
+            name: numpy.array(values, dtype=object if None in values
+                              else None)
+            for name, values in zip(self.columns.names, self.values)
+        }
+
+    def to_arrow(self):
+        """Return the batch as a pyarrow RecordBatch"""
+        if pyarrow is None:
+            raise ImportError('ColumnBatch.to_arrow requires pyarrow')
+        return pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array(values) for values in self.values],
+            names=self.columns.names)
+
+
+def iter_batches(pages, columns, batch_rows=10000):
+    """Generate ColumnBatches of at most batch_rows rows from the items of
+    pages, an iterable of pages as returned by iter_pages."""
+    batch = ColumnBatch(columns)
+    for page in pages:
+        for item in page_items(page):
+            batch.append(item)
+            if len(batch) >= batch_rows:
+                yield batch
+                batch = ColumnBatch(columns)
+    if len(batch):
+        yield batch
+
+
+def export(pages, columns, writer, batch_rows=10000):
+    """Write the items of pages, an iterable of pages as returned by
+    iter_pages, with writer, a batch at a time, and return the number of
+    rows written."""
+    rows = 0
+    for batch in iter_batches(pages, columns, batch_rows):
+        writer.write(batch)
+        rows += len(batch)
+    return rows
+
+
+class Writer(object):
+    """Base class of the writers of exports, which are context managers
+    writing ColumnBatches to a file."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, batch):
+        """Write the rows of a ColumnBatch"""
+        raise NotImplementedError
+
+    def close(self):
+        """Finish the file"""
+        raise NotImplementedError
+
+
+class CSVWriter(Writer):
+    """Writes CSV files, with a header row of the column names. Lists and
+    objects are written as JSON, None as an empty field.
+
+    dest           - Path of the file, or text file, a binary one on
+                     Python 2 whose csv module writes UTF-8 bytes.
+    columns        - Columns of the export.
+    **fmtparams    - Formatting parameters of csv.writer.
+    """
+
+    def __init__(self, dest, columns, **fmtparams):
+        self._owned = not hasattr(dest, 'write')
+        if not self._owned:
+            self.file = dest
+        elif PY2:
+            self.file = open(dest, 'wb')
+        else:
+            self.file = io.open(dest, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file, **fmtparams)
+        self.writer.writerow(columns.names)
+
+    def write(self, batch):
+        self.writer.writerows(
+            [self.format(value) for value in row] for row in batch.rows()
+        )
+
+    @staticmethod
+    def format(value):
+        if type(value) in (list, dict):
+            return json.dumps(value)
+        if PY2 and isinstance(value, text_type):
+            return value.encode('utf-8')
+        return value
+
+    def close(self):
+        if self._owned:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+class ParquetWriter(Writer):
+    """Writes Parquet files with pyarrow, a row group per batch.
+
+    dest           - Path of the file, or binary file.
+    columns        - Columns of the export.
+    schema         - pyarrow Schema of the file, inferred from the first
+                     batch by default.
+    types          - Dictionary of pyarrow types of some columns, by name,
+                     overriding the types inferred from the first batch.
+    **kwargs       - Arguments of pyarrow.parquet.ParquetWriter.
+
+    The types of the file can't change once it is started, so a column
+    which only holds None in the first batch, or empty lists, needs its type
+    given in `types` or `schema`. Nullable fields such as `closed_at` or
+    `milestone.title` often do.
+    """
+
+    def __init__(self, dest, columns, schema=None, types=None, **kwargs):
+        if pyarrow is None:
+            raise ImportError('ParquetWriter requires pyarrow')
+        self.dest = dest
+        self.columns = columns
+        self.schema = schema
+        self.types = types or {}
+        self.kwargs = kwargs
+        self.writer = None
+
+    def infer_schema(self, record_batch):
+        """Return the schema of the file given its first batch, raising a
+        ValueError if the type of a column can't be told from it"""
+        fields = [
+            pyarrow.field(field.name, self.types[field.name])
+            if field.name in self.types else field
+            for field in record_batch.schema
+        ]
+        untyped = [field.name for field in fields if has_null_type(field.type)]
+        if untyped:
+            raise ValueError(
+                'The type of columns %s is unknown, as they only hold None '
+                'or empty lists in the first batch: pass their types' %
+                ', '.join(untyped))
+        return pyarrow.schema(fields)
+
+    def write(self, batch):
+        record_batch = batch.to_arrow()
+        if self.writer is None:
+            if self.schema is None:
+                self.schema = self.infer_schema(record_batch)
+            self.writer = pyarrow.parquet.ParquetWriter(
+                self.dest, self.schema, **self.kwargs)
+        if record_batch.schema != self.schema:
+            record_batch = pyarrow.RecordBatch.from_arrays(
+                [pyarrow.array(values, type=field.type) for values, field
+                 in zip(batch.values, self.schema)],
+                schema=self.schema)
+        self.writer.write_table(pyarrow.Table.from_batches([record_batch]))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def has_null_type(data_type):
+    """Whether a pyarrow type is null or nests a null type, like the
+    list<null> of a column of empty lists"""
+    if pyarrow.types.is_null(data_type):
+        return True
+    return any(has_null_type(data_type.field(index).type)
+               for index in range(data_type.num_fields))
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.instrumentation
+~~~~~~~~~~~~~~~~~~~~~~~
+
+This module contains request instrumentation. When an Instrumentation is
+handed to the client, every request made through it, or any resource reached
+from it, publishes a RequestEvent to the subscribers:
+
+>>> instrumentation = octokit.instrumentation.Instrumentation()
+>>> latencies = octokit.instrumentation.LatencyAggregator()
+>>> instrumentation.subscribe(latencies)
+>>> client = octokit.Client(instrumentation=instrumentation)
+>>> client.user('octocat')
+>>> print(latencies.report())
+"""
+
+import collections
+import re
+import threading
+import time
+
+import requests
+
+from .decoding import decode_response
+from .exceptions import Error
+
+# Literal query string at the end of a URL, outside of template expressions
+QUERY_STRING = re.compile(r'\?[^{}]*$')
+
+
+class RequestEvent(object):
+    """Measurements of a single request.
+
+    method         - HTTP method.
+    template       - URI template of the resource, without literal query
+                     string, e.g. https://api.github.com/users{/user}.
+                     Resources reached through hypermedia links or `next`
+                     relations have their URL already expanded, like
+                     https://api.github.com/repos/octokit/octokit.py/issues.
+    url            - The expanded URL.
+    status         - Response status, None if no response was received.
+    bytes          - Size of the response body, None if unknown because
+                     the body wasn't read, like the payloads rebuilt from a
+                     ResponseStore.
+    ttfb           - Seconds until the response headers were received.
+    latency        - Seconds spent sending the request, including retries.
+    decode_time    - Seconds spent decoding the JSON body.
+    parse_time     - Seconds spent building the Resource.
+    cache          - 'hit' or 'miss' when a cache is set on the session.
+    error          - The exception raised, if any.
+    """
+
+    __slots__ = ('method', 'template', 'url', 'status', 'bytes', 'ttfb',
+                 'latency', 'decode_time', 'parse_time', 'cache', 'error')
+
+    def __init__(self, method, template, url):
+        self.method = method
+        self.template = template
+        self.url = url
+        self.status = None
+        self.bytes = 0
+        self.ttfb = None
+        self.latency = None
+        self.decode_time = 0.0
+        self.parse_time = 0.0
+        self.cache = None
+        self.error = None
+
+    def __repr__(self):
+        s = ', '.join(
+            '{}={!r}'.format(slot, getattr(self, slot))
+            for slot in self.__slots__
+        )
+        return '%s(%s)' % (self.__class__.__name__, s)
+
+
+def body_size(response):
+    """Return the size of the body of response, from its Content-Length
+    header if it wasn't read: reading the body of a StoredResponse encodes
+    its payload back to JSON."""
+    if response._content is False:
+        length = response.headers.get('Content-Length')
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
+
+
+class Instrumentation(object):
+    """Measures requests and publishes them to subscribers, callables taking
+    a RequestEvent. Subscribers are called from the requesting thread."""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscriber):
+        """Call subscriber with the event of every request"""
+        with self._lock:
+            self.subscribers = self.subscribers + [subscriber]
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self.subscribers = [
+                s for s in self.subscribers if s != subscriber
+            ]
+
+    def publish(self, event):
+        for subscriber in self.subscribers:
+            subscriber(event)
+
+    def fetch(self, resource, request, fields=None):
+        """Send a prepared request for resource, build the resulting Resource
+        and publish the measurements of both."""
+        event = RequestEvent(request.method,
+                             QUERY_STRING.sub('', resource.url), request.url)
+        start = self.clock()
+        try:
+            response = resource.send_with_retry(request)
+        except (Error, requests.RequestException) as error:
+            event.latency = self.clock() - start
+            event.error = error
+            if error.response is not None:
+                event.status = error.response.status_code
+                event.bytes = body_size(error.response)
+            self.publish(event)
+            raise
+
+        event.latency = self.clock() - start
+        event.status = response.status_code
+        event.bytes = body_size(response)
+        if response.elapsed:
+            event.ttfb = response.elapsed.total_seconds()
+        if getattr(resource.session, 'cache', None) is not None:
+            event.cache = 'hit' if getattr(response, 'from_cache', False) \
+                else 'miss'
+
+        start = self.clock()
+        decode_response(response)
+        event.decode_time = self.clock() - start
+
+        start = self.clock()
+        result = resource.build_resource(response, fields)
+        event.parse_time = self.clock() - start
+
+        self.publish(event)
+        return result
+
+
+class LatencyAggregator(object):
+    """A subscriber keeping the latest latencies of every endpoint, keyed by
+    method and URI template, to report their percentiles.
+
+    samples        - Latencies kept per endpoint.
+    max_endpoints  - Endpoints tracked. Templates of resources reached
+                     through links are expanded URLs, one per object, so the
+                     events of endpoints past this many are only counted in
+                     `dropped`.
+    """
+
+    def __init__(self, samples=10000, max_endpoints=1000):
+        self.samples = samples
+        self.max_endpoints = max_endpoints
+        self.dropped = 0
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event.latency is None:
+            return
+        key = (event.method, event.template)
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                if len(self._latencies) >= self.max_endpoints:
+                    self.dropped += 1
+                    return
+                latencies = self._latencies[key] = collections.deque(
+                    maxlen=self.samples)
+            latencies.append(event.latency)
+
+    def percentiles(self, percentiles=(50, 95, 99)):
+        """Return {(method, template): {'count': n, 'p50': seconds, ...}}"""
+        with self._lock:
+            samples = {k: sorted(v) for k, v in self._latencies.items()}
+
+        stats = {}
+        for key, latencies in samples.items():
+            stats[key] = {'count': len(latencies)}
+            for percentile in percentiles:
+                # nearest-rank percentile
+                rank = max(int(-(-percentile * len(latencies) // 100)), 1)
+                stats[key]['p%d' % percentile] = latencies[rank - 1]
+        return stats
+
+    def report(self):
+        """Return the percentiles as a table, in milliseconds"""
+        lines = ['%-7s %-60s %7s %9s %9s %9s' % (
+            'method', 'template', 'count', 'p50 ms', 'p95 ms', 'p99 ms')]
+        for (method, template), s in sorted(self.percentiles().items()):
+            lines.append('%-7s %-60s %7d %9.1f %9.1f %9.1f' % (
+                method, template, s['count'], s['p50'] * 1000,
+                s['p95'] * 1000, s['p99'] * 1000))
+        return '\n'.join(lines)
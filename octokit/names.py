@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.names
+~~~~~~~~~~~~~
+
+This module contains memoized versions of the inflections used to name
+resources. The same few JSON keys (`owner`, `user`, `labels`...) are inflected
+over and over while parsing responses, and inflection runs a pipeline of
+regular expressions every time, so results are kept in bounded tables warmed
+with the keys of GitHub's schema.
+"""
+
+import inflection
+
+from .compat import intern, lru_cache
+
+# Keys found throughout GitHub's API responses
+COMMON_KEYS = (
+    'archive', 'assignee', 'assignees', 'avatar', 'base', 'blobs', 'branches',
+    'clone', 'collaborators', 'comments', 'commit', 'commits', 'compare',
+    'contents', 'contributors', 'deployments', 'downloads', 'events',
+    'followers', 'following', 'forks', 'gists', 'git', 'head', 'hooks',
+    'html', 'issue', 'issues', 'keys', 'labels', 'languages', 'license',
+    'members', 'merges', 'milestone', 'milestones', 'notifications', 'org',
+    'organization', 'organizations', 'owner', 'parent', 'parents', 'payload',
+    'permissions', 'public_members', 'pull_request', 'pulls',
+    'received_events', 'releases', 'repo', 'repos', 'repository',
+    'repositories', 'review_comments', 'source', 'starred', 'stargazers',
+    'statuses', 'subscribers', 'subscription', 'subscriptions', 'tags',
+    'teams', 'trees', 'user', 'users',
+)
+
+
+@lru_cache(maxsize=4096)
+def humanize(name):
+    """Memoized inflection.humanize, returning interned strings"""
+    return intern(inflection.humanize(name))
+
+
+@lru_cache(maxsize=4096)
+def singularize(name):
+    """Memoized inflection.singularize, returning interned strings"""
+    return intern(inflection.singularize(name))
+
+
+@lru_cache(maxsize=4096)
+def item_name(name):
+    """Return the name of the resources listed under name"""
+    return humanize(singularize(name))
+
+
+def warm(keys=COMMON_KEYS):
+    """Fill the tables with the inflections of keys"""
+    for key in keys:
+        humanize(key)
+        item_name(key)
+
+
+warm()
@@ -1,4 +1,10 @@
-from .resources import Resource
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+except ImportError:  # Python 2
+    from urllib import urlencode
+    from urlparse import parse_qsl, urlsplit, urlunsplit
 
 
 class Pagination(object):
@@ -13,26 +19,275 @@ class Pagination(object):
         return super(Pagination, self).response_callback(r, **kwargs)
 
     def paginate(self, *args, **kwargs):
-        params = {}
-        if 'per_page' in kwargs:
-            params['per_page'] = kwargs['per_page']
-            del kwargs['per_page']
-        elif self.auto_paginate:
-            # if per page is not defined, default to 100 per page
-            params['per_page'] = 100
-
-        if 'page' in kwargs:
-            params['page'] = kwargs['page']
-            del kwargs['page']
-
-        kwargs['params'] = params
-        resource = self.get(*args, **kwargs)
-        data = list(resource.schema)
-
-        if self.auto_paginate:
-            while 'next' in resource.rels and self.rate_limit.remaining > 0:
-                resource = resource.rels['next'].get()
-                data.extend(list(resource.schema))
-
-        return Resource(self.session, schema=data,
-                        url=resource.url, name=resource.name)
+        if not self.auto_paginate:
+            kwargs['max_pages'] = 1
+            kwargs.setdefault('per_page', None)
+
+        data = []
+        for resource in self.iter_pages(*args, **kwargs):
+            data.extend(list(resource.schema))
+
+        return self.resource_class(self.session, schema=data,
+                                   url=resource.url, name=resource.name)
+
+    def iter_pages(self, *args, **kwargs):
+        """Lazily iterate over the pages of a listing, following the `next`
+        relation of each page only once the previous one was consumed.
+
+        resource       - Resource whose listing to iterate, the client itself
+                         by default.
+        max_pages      - Stop after this many pages.
+        cursor         - URL of the page to start from, as saved from the
+                         `cursor` attribute of a previous iterator.
+        per_page/page  - Pagination parameters, per_page defaults to 100.
+        prefetch       - When the first page links to the `last` one, fetch
+                         the remaining pages concurrently. Pages are still
+                         returned in order.
+        concurrency    - Maximum number of pages prefetched at once.
+        fields         - Fields kept from the items of every page, see
+                         Resource.fetch_resource.
+        """
+        resource = kwargs.pop('resource', None)
+        max_pages = kwargs.pop('max_pages', None)
+        cursor = kwargs.pop('cursor', None)
+        prefetch = kwargs.pop('prefetch', False)
+        concurrency = kwargs.pop('concurrency', 4)
+        kwargs['params'] = page_params(kwargs)
+
+        if prefetch:
+            return PrefetchPageIterator(self, args, kwargs, max_pages, cursor,
+                                        resource, concurrency=concurrency)
+        return PageIterator(self, args, kwargs, max_pages, cursor, resource)
+
+    def iter_items(self, *args, **kwargs):
+        """Lazily iterate over the items of a listing, page by page.
+
+        Accepts the arguments of `iter_pages`, plus `max_items` to stop after
+        that many items.
+        """
+        max_items = kwargs.pop('max_items', None)
+        return ItemIterator(self.iter_pages(*args, **kwargs), max_items)
+
+
+def page_params(kwargs):
+    """Pop the per_page and page arguments out of kwargs and return them
+    with the other query parameters of kwargs. per_page defaults to 100
+    unless explicitly None."""
+    params = dict(kwargs.pop('params', None) or {})
+    per_page = kwargs.pop('per_page', 100)
+    if per_page is not None:
+        params['per_page'] = per_page
+    if 'page' in kwargs:
+        params['page'] = kwargs.pop('page')
+    return params
+
+
+class PageIterator(object):
+    """Iterator over the pages of a listing.
+
+    `cursor` is the URL of the next page to be fetched, or None once the last
+    page was reached. Saving it and passing it back to `iter_pages` resumes
+    the listing where it stopped.
+    """
+
+    def __init__(self, client, args, kwargs, max_pages=None, cursor=None,
+                 resource=None):
+        self.client = client
+        self.resource = client if resource is None else resource
+        self.args = args
+        self.kwargs = kwargs
+        self.max_pages = max_pages
+        self.cursor = cursor
+        self.pages = 0
+        self._started = cursor is not None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            raise StopIteration
+
+        if not self._started:
+            self._started = True
+            page = self.resource.get(*self.args, **self.kwargs)
+        elif self.cursor is None:
+            raise StopIteration
+        elif self.pages and self.exhausted():
+            raise StopIteration
+        else:
+            page = self.fetch_page(self.cursor)
+
+        next_page = page.rels.get('next')
+        self.cursor = next_page.url if next_page else None
+        self.pages += 1
+        return page
+
+    next = __next__
+
+    def exhausted(self):
+        """Whether the rate limit is spent. With a scheduler on the session
+        requests wait for the reset instead, so it never is."""
+        if getattr(self.client.session, 'scheduler', None) is not None:
+            return False
+        remaining = self.client.rate_limit.remaining
+        return remaining is not None and remaining <= 0
+
+    def fetch_page(self, url):
+        """Fetch a single page of the listing by URL"""
+        return self.client.resource_class(
+            self.client.session, url=url, name=self.resource.name
+        ).get(fields=self.kwargs.get('fields'))
+
+
+class PrefetchPageIterator(PageIterator):
+    """Iterator over the pages of a listing that fetches the pages following
+    the first one concurrently, once the `last` relation tells how many there
+    are. Listings without a `last` relation are followed serially.
+
+    The number of requests in flight shrinks linearly once the rate limit
+    remaining drops below `slowdown_below`, down to one at a time, and no new
+    request is made once it is exhausted.
+    """
+
+    def __init__(self, client, args, kwargs, max_pages=None, cursor=None,
+                 resource=None, concurrency=4, slowdown_below=100):
+        super(PrefetchPageIterator, self).__init__(
+            client, args, kwargs, max_pages, cursor, resource)
+        self.concurrency = concurrency
+        self.slowdown_below = slowdown_below
+        self._pages = None
+
+    def __next__(self):
+        if self._pages is None:
+            first = super(PrefetchPageIterator, self).__next__()
+            self._pages = self.prefetch(self.page_urls(first))
+            return first
+
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            self.close()
+            raise StopIteration
+        return next(self._pages)
+
+    next = __next__
+
+    def close(self):
+        """Stop prefetching, waiting only for the requests in flight"""
+        if self._pages is not None:
+            self._pages.close()
+
+    def page_urls(self, page):
+        """Return the URLs of the pages following page, as given by its
+        `last` relation, or an empty list if there's none."""
+        last = page.rels.get('last')
+        if 'next' not in page.rels or last is None:
+            return []
+
+        scheme, netloc, path, query, fragment = urlsplit(last.url)
+        params = parse_qsl(query)
+        next_params = dict(parse_qsl(urlsplit(page.rels['next'].url).query))
+        if 'page' not in next_params or 'page' not in dict(params):
+            return []
+
+        first_page = int(next_params['page'])
+        last_page = int(dict(params)['page'])
+
+        urls = []
+        for number in range(first_page, last_page + 1):
+            query = urlencode([
+                (k, number if k == 'page' else v) for k, v in params
+            ])
+            urls.append(urlunsplit((scheme, netloc, path, query, fragment)))
+        return urls
+
+    def in_flight_limit(self):
+        """Return how many requests may be in flight given the rate limit"""
+        if self.exhausted():
+            return 0
+        remaining = self.client.rate_limit.remaining
+        if remaining is None or remaining >= self.slowdown_below:
+            return self.concurrency
+        if remaining <= 0:
+            return 1
+        return max(1, self.concurrency * remaining // self.slowdown_below)
+
+    def prefetch(self, urls):
+        """Generate the pages at urls in order, fetching them concurrently"""
+        if not urls:
+            # No `last` relation, fall back to following `next` serially
+            while True:
+                try:
+                    page = super(PrefetchPageIterator, self).__next__()
+                except StopIteration:
+                    return
+                yield page
+
+        stop = len(urls)
+        if self.max_pages is not None:
+            stop = min(stop, self.max_pages - self.pages)
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        futures = []
+        submitted = 0
+        try:
+            while submitted < stop or futures:
+                limit = self.in_flight_limit()
+                while submitted < stop and len(futures) < limit:
+                    futures.append(executor.submit(
+                        self.fetch_page, urls[submitted]))
+                    submitted += 1
+                if not futures:
+                    break
+
+                page = futures.pop(0).result()
+                fetched = submitted - len(futures)
+                self.cursor = urls[fetched] if fetched < len(urls) else None
+                self.pages += 1
+                yield page
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+class ItemIterator(object):
+    """Iterator over the items of a listing, fetching pages as needed."""
+
+    def __init__(self, pages, max_items=None):
+        self.pages = pages
+        self.max_items = max_items
+        self.count = 0
+        self._items = iter(())
+        self._page_url = None
+        self._page_remaining = 0
+
+    @property
+    def cursor(self):
+        """URL to resume from. When stopped in the middle of a page this is
+        the URL of that page, so resuming never skips items."""
+        if self._page_remaining:
+            return self._page_url
+        return self.pages.cursor
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.max_items is not None and self.count >= self.max_items:
+            raise StopIteration
+
+        while True:
+            try:
+                item = next(self._items)
+            except StopIteration:
+                page = next(self.pages)
+                schema = page.schema
+                self._items = iter(schema)
+                self._page_url = page.url
+                self._page_remaining = len(schema)
+            else:
+                self._page_remaining -= 1
+                self.count += 1
+                return item
+
+    next = __next__
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.poll
+~~~~~~~~~~~~
+
+This module contains the polling of many resources from a single process.
+Resources are registered with a callback receiving their new items, and a
+Poller requests each of them when it is due:
+
+>>> poller = octokit.poll.Poller(client, workers=16)
+>>> poller.watch(client.repository_events, on_events,
+...              owner='octokit', repo='octokit.py')
+>>> poller.watch(client.notifications, on_notifications)
+>>> poller.run()
+
+Every poll after the first is conditional on the ETag/Last-Modified of the
+previous response, and 304s don't count against the rate limit. Resources
+are never polled more often than their `X-Poll-Interval` header asks, and
+the interval of resources which don't change grows up to `max_interval`.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .decoding import decode_response
+
+
+class Watch(object):
+    """A resource watched by a Poller, and the state of its polling.
+
+    `polls` counts the successful polls, `error` holds the exception of the
+    last poll if it failed, and `seen` the ids of the last listing.
+    """
+
+    __slots__ = ('resource', 'callback', 'args', 'kwargs', 'fields',
+                 'id_field', 'interval', 'active', 'etag', 'last_modified',
+                 'poll_interval', 'idle', 'seen', 'polls', 'error',
+                 'next_due')
+
+    def __init__(self, resource, callback, args, kwargs, fields, id_field,
+                 interval):
+        self.resource = resource
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.fields = fields
+        self.id_field = id_field
+        self.interval = interval
+        self.active = True
+        self.etag = None
+        self.last_modified = None
+        self.poll_interval = None
+        self.idle = 0
+        self.seen = None
+        self.polls = 0
+        self.error = None
+        self.next_due = None
+
+    def add_validators(self, headers):
+        """Make the next request conditional on the last response"""
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+    def __repr__(self):
+        return '<Watch %s>' % self.resource.url
+
+
+class Poller(object):
+    """Polls watched resources, each when it is due, and hands their new
+    items to the callbacks of the watches.
+
+    client         - The Client making the requests, through the scheduler,
+                     retry policy and rate limit of its session.
+    workers        - Number of polls in flight, and threads running them.
+    interval       - Seconds between the polls of a resource.
+    max_interval   - Longest interval resources which don't change back
+                     off to.
+    backoff        - Factor of the interval per poll finding no change.
+    jitter         - Fraction of the interval by which polls are randomly
+                     delayed, so that watches don't come due together.
+    initial        - Whether the first poll of a resource hands the items it
+                     already has to the callback, rather than only
+                     recording them.
+    on_error       - Function called with the watch and the exception when a
+                     poll fails. The resource is polled again later, even if
+                     on_error raises.
+    clock          - Time function, replaceable for testing.
+    """
+
+    def __init__(self, client, workers=8, interval=60, max_interval=900,
+                 backoff=2, jitter=0.1, initial=False, on_error=None,
+                 clock=time.time):
+        self.client = client
+        self.workers = workers
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.initial = initial
+        self.on_error = on_error
+        self.clock = clock
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._stopped = False
+        self._thread = None
+
+    def __len__(self):
+        return sum(1 for _, _, watch in self._queue if watch.active)
+
+    def watch(self, resource, callback, *args, **kwargs):
+        """Watch a resource and return its Watch.
+
+        resource       - Resource to poll, the client itself by default.
+        callback       - Function called with the watch and the list of the
+                         new items when some were found. Resources which
+                         aren't listings are handed over whole when they
+                         change.
+        id_field       - Item field identifying the items of listings.
+        interval       - Seconds between polls, the poller's by default.
+        fields         - JSON keys or dotted paths of keys to keep from
+                         the items.
+        *args/**kwargs - Uri template and request arguments, as taken by
+                         fetch_resource.
+        """
+        if resource is None:
+            resource = self.client
+        watch = Watch(resource, callback, args, kwargs,
+                      fields=kwargs.pop('fields', None),
+                      id_field=kwargs.pop('id_field', 'id'),
+                      interval=kwargs.pop('interval', self.interval))
+        self.schedule(watch, self.clock())
+        return watch
+
+    def unwatch(self, watch):
+        """Stop polling a watch"""
+        watch.active = False
+
+    def schedule(self, watch, due):
+        """Queue a watch to be polled at time due"""
+        watch.next_due = due
+        with self._condition:
+            heapq.heappush(self._queue, (due, next(self._counter), watch))
+            self._condition.notify()
+
+    def next_delay(self, watch, changed):
+        """Return the seconds until the next poll of a watch, given whether
+        the last poll found a change"""
+        longest = max(self.max_interval, watch.interval)
+        if changed:
+            watch.idle = 0
+        elif watch.interval * self.backoff ** watch.idle < longest:
+            # Stop counting once max_interval is reached, the power would
+            # otherwise grow until it overflows
+            watch.idle += 1
+        delay = min(watch.interval * self.backoff ** watch.idle, longest)
+        delay = max(delay, watch.poll_interval or 0)
+        if self.jitter:
+            delay += random.uniform(0, delay * self.jitter)
+        return delay
+
+    def poll(self, watch):
+        """Poll a watch once, calling its callback with the new items, and
+        return the seconds until it is due again."""
+        try:
+            changed = self.fetch(watch)
+        except Exception as error:
+            watch.error = error
+            if self.on_error is not None:
+                self.on_error(watch, error)
+            changed = False
+        else:
+            watch.error = None
+            watch.polls += 1
+        return self.next_delay(watch, changed)
+
+    def fetch(self, watch):
+        """Request a watch and dispatch what changed, returning whether the
+        resource changed since the previous poll"""
+        kwargs = dict(watch.kwargs)
+        headers = dict(kwargs.pop('headers', None) or {})
+        watch.add_validators(headers)
+
+        resource = watch.resource
+        request = resource.prepare_request('GET', *watch.args,
+                                           headers=headers, **kwargs)
+        response = resource.send_with_retry(request)
+
+        poll_interval = response.headers.get('X-Poll-Interval')
+        if poll_interval:
+            watch.poll_interval = int(poll_interval)
+        if response.status_code == 304:
+            return False
+        watch.etag = response.headers.get('ETag')
+        watch.last_modified = response.headers.get('Last-Modified')
+
+        data = decode_response(response)
+        first = watch.polls == 0
+        if type(data) == list:
+            ids = [item.get(watch.id_field) for item in data]
+            previous = watch.seen if watch.seen is not None else ()
+            watch.seen = frozenset(ids)
+            new = [i for i, item_id in enumerate(ids)
+                   if item_id not in previous]
+            if first and not self.initial:
+                return True
+            if not new:
+                return False
+            page = resource.build_resource(response, watch.fields)
+            watch.callback(watch, [page.schema[i] for i in new])
+        elif not first or self.initial:
+            watch.callback(watch, [resource.build_resource(response,
+                                                           watch.fields)])
+        return True
+
+    def run_pending(self):
+        """Poll the watches which are due, one after the other in the calling
+        thread, and return how many were polled."""
+        polled = 0
+        now = self.clock()
+        while True:
+            with self._condition:
+                if not self._queue or self._queue[0][0] > now:
+                    return polled
+                watch = heapq.heappop(self._queue)[2]
+            if watch.active:
+                polled += 1
+                self._poll_and_schedule(watch)
+
+    def run(self):
+        """Poll the watches as they come due with a pool of worker threads,
+        until `stop` is called."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                watch = self._next_due()
+                if watch is None:
+                    return
+                executor.submit(self._poll_in_worker, watch)
+
+    def _next_due(self):
+        """Wait for a watch to be due and a worker to be free, and return it,
+        or None once stopped"""
+        with self._condition:
+            while not self._stopped:
+                timeout = None
+                if self._queue and self._in_flight < self.workers:
+                    due, _, watch = self._queue[0]
+                    if not watch.active:
+                        heapq.heappop(self._queue)
+                        continue
+                    timeout = due - self.clock()
+                    if timeout <= 0:
+                        heapq.heappop(self._queue)
+                        self._in_flight += 1
+                        return watch
+                self._condition.wait(timeout)
+        return None
+
+    def _poll_and_schedule(self, watch):
+        """Poll a watch and queue its next poll, even if polling raised"""
+        delay = watch.interval
+        try:
+            delay = self.poll(watch)
+        finally:
+            if watch.active:
+                self.schedule(watch, self.clock() + delay)
+
+    def _poll_in_worker(self, watch):
+        try:
+            self._poll_and_schedule(watch)
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+    def start(self):
+        """Run the poller in a background thread"""
+        self._stopped = False
+        self._thread = threading.Thread(target=self.run)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling, waiting for the polls in flight to complete"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
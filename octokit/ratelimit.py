@@ -10,33 +10,66 @@ class RateLimit(object):
 
     def response_callback(self, r, **kwargs):
         self.last_response = r
+        self._rate_limit.update(r.headers)
         return super(RateLimit, self).response_callback(r, **kwargs)
 
     @property
     def rate_limit(self):
-        self.update_rate_limit()
+        """The rate limit as of the last response the session received, from
+        this client or any resource reached from it. Reading it never makes a
+        request, its values are None until a response was received."""
         return self._rate_limit
 
-    def update_rate_limit(self):
-        if not self.last_response:
-            self.head()
+    def refresh_rate_limit(self):
+        """Fetch the rate limit from the /rate_limit endpoint, whose calls
+        don't count against it, and return it."""
+        url = self.url.rstrip('/') + '/rate_limit'
+        response = self.resource_class(self.session, url=url,
+                                       name='Rate limit').get()
+        core = response.schema['resources']['core']
 
         rate_limit = self._rate_limit
-        headers = self.last_response.headers
+        rate_limit.limit = core['limit']
+        rate_limit.remaining = core['remaining']
+        rate_limit.resets_at = core['reset']
+        return rate_limit
 
-        rate_limit.limit = int(headers['X-RateLimit-Limit'])
-        rate_limit.remaining = int(headers['X-RateLimit-Remaining'])
-        rate_limit.resets_at = int(headers['X-RateLimit-Reset'])
-        delta = rate_limit.resets_at - calendar.timegm(time.gmtime())
-        rate_limit.resets_in = max(delta, 0)
+    def update_rate_limit(self):
+        """Refresh the rate limit, see refresh_rate_limit. Kept for the code
+        written before the rate limit was tracked from the responses."""
+        return self.refresh_rate_limit()
 
 
 class _RateLimit(object):
-    __slots__ = ('limit', 'remaining', 'resets_at', 'resets_in')
+    __slots__ = ('limit', 'remaining', 'resets_at')
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.resets_at = None
+
+    @property
+    def resets_in(self):
+        """Seconds until the rate limit resets"""
+        if self.resets_at is None:
+            return None
+        delta = self.resets_at - calendar.timegm(time.gmtime())
+        return max(delta, 0)
+
+    def update(self, headers):
+        """Update the rate limit from the headers of a response"""
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+
+        self.remaining = int(headers['X-RateLimit-Remaining'])
+        if 'X-RateLimit-Limit' in headers:
+            self.limit = int(headers['X-RateLimit-Limit'])
+        if 'X-RateLimit-Reset' in headers:
+            self.resets_at = int(headers['X-RateLimit-Reset'])
 
     def __repr__(self):
         s = ', '.join(
-            '{}={}'.format(slot, getattr(self, slot))
-            for slot in self.__slots__
+            '{}={}'.format(name, getattr(self, name))
+            for name in self.__slots__ + ('resets_in',)
         )
         return '%s(%s)' % (self.__class__, s)
@@ -7,32 +7,59 @@ octokit.resources
 This module contains the workhorse of octokit.py, the Resources.
 """
 
-from inflection import humanize, singularize
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:  # Python 2
+    from collections import Mapping, Sequence
+
+import os
+
 import requests
-import uritemplate
+
+from .compat import MappingProxyType
+from .decoding import decode_response, project_response
+from .exceptions import ClientError
+from .names import humanize, item_name
+from .utils import compile_template
+
+# Relations of every resource without links, shared and read-only
+EMPTY_RELS = MappingProxyType({})
+
+# Size of the chunks downloads are streamed in
+CHUNK_SIZE = 64 * 1024
 
 
 class Resource(object):
     """The workhorse of octokit.py, this class makes the API calls and
     interprets them into an accessible schema. The API calls and schema parsing
     are lazy and only happen when an attribute of the resource is requested.
+
+    Resources are slotted, as listings hold many of them, and drop the
+    response they were parsed from unless the session's `keep_response`
+    attribute is set.
     """
 
+    __slots__ = ('session', 'name', 'url', 'schema', 'response', 'rels')
+
     def __init__(self, session, name=None, url=None, schema=None,
                  response=None):
         self.session = session
         self.name = name
         self.url = url
         self.schema = schema
-        self.response = response
-        self.rels = {}
+        self.response = None
+        self.rels = EMPTY_RELS
 
         if response:
-            self.schema = self.parse_schema(response.json())
+            data = decode_response(response)
+            if data is not None:
+                self.schema = self.parse_schema(data)
             self.rels = self.parse_rels(response)
             self.url = response.url
+            if getattr(session, 'keep_response', False):
+                self.response = response
 
-        if type(self.schema) == dict and 'url' in self.schema:
+        if isinstance(self.schema, Mapping) and 'url' in self.schema:
             self.url = self.schema['url']
 
     def __getattr__(self, name):
@@ -51,10 +78,9 @@ class Resource(object):
 
     def __repr__(self):
         self.ensure_schema_loaded()
-        schema_type = type(self.schema)
-        if schema_type == dict:
+        if isinstance(self.schema, Mapping):
             subtitle = ', '.join(self.schema.keys())
-        elif schema_type == list:
+        elif isinstance(self.schema, (list, LazySchemaList)):
             subtitle = str(len(self.schema))
         else:
             subtitle = str(self.schema)
@@ -63,7 +89,7 @@ class Resource(object):
 
     def variables(self):
         """Returns the variables the URI takes"""
-        return uritemplate.variables(self.url)
+        return compile_template(self.url).variable_names
 
     def keys(self):
         """Returns the links this resource can follow"""
@@ -74,7 +100,9 @@ class Resource(object):
         """Check if resources' schema has been loaded, otherwise load it"""
         if self.schema:
             return
-        elif self.variables():
+
+        variables = self.variables()
+        if variables:
             raise Exception("You need to call this resource with variables %s"
                             % repr(list(variables)))
 
@@ -96,38 +124,19 @@ class Resource(object):
 
     def parse_schema_dict(self, data):
         """Convert the responses' JSON into a dictionary of resources"""
-        schema = {}
-        for key in data:
-            name = key.split('_url')[0]
-            if key.endswith('_url'):
-                if data[key]:
-                    schema[name] = Resource(self.session, url=data[key],
-                                            name=humanize(name))
-                else:
-                    schema[name] = data[key]
-            else:
-                data_type = type(data[key])
-                if data_type == dict:
-                    schema[name] = Resource(self.session, schema=data[key],
-                                            name=humanize(name))
-                elif data_type == list:
-                    schema[name] = self.parse_schema_list(data[key], name=name)
-                else:
-                    schema[name] = data[key]
-
-        return schema
+        return LazySchemaDict(self.session, self.resource_class, data)
 
     def parse_schema_list(self, data, name):
         """Convert the responses' JSON into a list of resources"""
-        return [
-          Resource(self.session, schema=s, name=humanize(singularize(name)))
-          for s in data
-        ]
+        return LazySchemaList(self.session, self.resource_class, data, name)
 
     def parse_rels(self, response):
         """Parse relation links from the headers"""
+        if 'Link' not in response.headers:
+            return EMPTY_RELS
         return {
-          link['rel']: Resource(self.session, url=link['url'], name=self.name)
+          link['rel']: self.resource_class(self.session, url=link['url'],
+                                           name=self.name)
           for link in response.links.values()
         }
 
@@ -165,18 +174,302 @@ class Resource(object):
         method         - HTTP method.
         *args          - Uri template argument
         **kwargs       – Uri template arguments
+        fields         - JSON keys or dotted paths of keys to keep from the
+                         response body, like ['number', 'user.login'], the
+                         rest being dropped before the schema is built.
         """
-        variables = self.variables()
+        fields = kwargs.pop('fields', None)
+        prepared_req = self.prepare_request(method, *args, **kwargs)
+
+        coalesce = getattr(self.session, 'coalesce', None)
+        if coalesce is not None and method == 'GET':
+            key = coalesce.key(prepared_req, fields)
+            return coalesce.do(
+                key, lambda: self.fetch_prepared(prepared_req, fields))
+        return self.fetch_prepared(prepared_req, fields)
+
+    def fetch_prepared(self, request, fields=None):
+        """Send a prepared request and return the response as a Resource"""
+        instrumentation = getattr(self.session, 'instrumentation', None)
+        if instrumentation is not None:
+            return instrumentation.fetch(self, request, fields)
+
+        return self.build_resource(self.send_with_retry(request), fields)
+
+    def build_resource(self, response, fields=None):
+        """Return the Resource of a response to a request of this resource,
+        keeping only the given fields of its body if any."""
+        if fields is not None:
+            project_response(response, fields)
+        return self.resource_class(self.session, response=response,
+                                   name=humanize(self.name))
+
+    def send_with_retry(self, request):
+        """Send a prepared request with send_request, retried according to
+        the retry policy of the session, if any, and return the response."""
+        retry = getattr(self.session, 'retry', None)
+        if retry is not None:
+            return retry.send(self.send_request, request)
+        return self.send_request(request)
+
+    def send_request(self, request):
+        """Send a prepared request through the scheduler and cache of the
+        session, if any, and return the response."""
+        cache = getattr(self.session, 'cache', None)
+        if cache is not None and request.method == 'GET':
+            response = cache.lookup(request)
+            if response is not None:
+                return response
+
+        scheduler = getattr(self.session, 'scheduler', None)
+        if scheduler is not None:
+            scheduler.schedule(request)
+
+        if cache is not None and request.method == 'GET':
+            return cache.send(self.session, request)
+        return self.session.send(request)
+
+    def prepare_request(self, method, *args, **kwargs):
+        """Expand the URI template and prepare the request with the session.
+
+        Takes the arguments of `fetch_resource`, keyword arguments which
+        aren't template variables are passed on to requests.Request.
+        """
+        template = compile_template(self.url)
+        variables = template.variable_names
         if len(args) == 1 and len(variables) == 1:
             kwargs[next(iter(variables))] = args[0]
 
         url_args = {k: kwargs[k] for k in kwargs if k in variables}
         req_args = {k: kwargs[k] for k in kwargs if k not in variables}
 
-        url = uritemplate.expand(self.url, url_args)
+        url = template.expand(url_args)
         request = requests.Request(method, url, **req_args)
-        prepared_req = self.session.prepare_request(request)
-        response = self.session.send(prepared_req)
+        return self.session.prepare_request(request)
+
+    def iter_bytes(self, *args, **kwargs):
+        """Stream the body of the endpoint in chunks, without decoding it.
+
+        chunk_size     - Size of the chunks, 64 KiB by default.
+        offset         - Position in the body to start from, requested with
+                         a Range header.
+        *args/**kwargs - Uri template and request arguments, as taken by
+                         fetch_resource.
+        """
+        chunk_size = kwargs.pop('chunk_size', CHUNK_SIZE)
+        offset = kwargs.pop('offset', 0)
+        response = self.open_stream(offset, *args, **kwargs)
+        return self.iter_chunks(response, offset, chunk_size)
+
+    def download(self, dest, *args, **kwargs):
+        """Download the body of the endpoint to dest, a path or binary file,
+        in constant memory, and return its size.
+
+        chunk_size     - Size of the chunks, 64 KiB by default.
+        resume         - Continue an interrupted download, from the end of
+                         the file at path dest or the position of file dest.
+        progress       - Function called with the bytes written so far and
+                         the total size, or None if unknown, after each
+                         chunk.
+        *args/**kwargs - Uri template and request arguments, as taken by
+                         fetch_resource.
+
+        Transfers broken by a connection error are resumed according to the
+        retry policy of the session, if any.
+        """
+        resume = kwargs.pop('resume', False)
+        if hasattr(dest, 'write'):
+            offset = dest.tell() if resume else 0
+            return self.download_to(dest, offset, *args, **kwargs)
+
+        offset = os.path.getsize(dest) if resume and \
+            os.path.exists(dest) else 0
+        with open(dest, 'ab' if offset else 'wb') as f:
+            return self.download_to(f, offset, *args, **kwargs)
+
+    def download_to(self, f, offset, *args, **kwargs):
+        """Write the body of the endpoint from offset on to file f, see
+        `download`"""
+        chunk_size = kwargs.pop('chunk_size', CHUNK_SIZE)
+        progress = kwargs.pop('progress', None)
+        retry = getattr(self.session, 'retry', None)
+        attempt = 0
+        while True:
+            try:
+                try:
+                    response = self.open_stream(offset, *args, **kwargs)
+                except ClientError as error:
+                    if offset and body_size(error.response, 0) == offset:
+                        return offset  # 416, there's nothing left to download
+                    raise
+
+                total = body_size(response, offset)
+                for chunk in self.iter_chunks(response, offset, chunk_size):
+                    f.write(chunk)
+                    offset += len(chunk)
+                    if progress is not None:
+                        progress(offset, total)
+                return offset
+            except (requests.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError) as error:
+                attempt += 1
+                if retry is None or attempt >= retry.max_attempts:
+                    raise
+                retry.sleep(retry.backoff(attempt - 1, error))
+
+    def open_stream(self, offset, *args, **kwargs):
+        """Send a streamed GET request for the body of the endpoint from
+        offset on and return the response, whose body is left unread.
+
+        Bodies are requested without content encoding so that offsets in
+        them are offsets in the bytes received.
+        """
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.setdefault('Accept-Encoding', 'identity')
+        if offset:
+            headers['Range'] = 'bytes=%d-' % offset
+        request = self.prepare_request('GET', *args, headers=headers,
+                                       **kwargs)
+
+        scheduler = getattr(self.session, 'scheduler', None)
+        if scheduler is not None:
+            scheduler.schedule(request)
+        return self.session.send(request, stream=True)
+
+    @staticmethod
+    def iter_chunks(response, offset, chunk_size):
+        """Generate the chunks of a streamed response from offset on, which
+        are skipped if the server ignored the Range header, then close it."""
+        skip = 0 if response.status_code == 206 else offset
+        try:
+            for chunk in response.iter_content(chunk_size):
+                if skip:
+                    if len(chunk) <= skip:
+                        skip -= len(chunk)
+                        continue
+                    chunk, skip = chunk[skip:], 0
+                yield chunk
+        finally:
+            response.close()
+
+
+# Class of the resources built while parsing a resource
+Resource.resource_class = Resource
+
+
+def body_size(response, offset):
+    """Return the size of the whole body of a, possibly partial, response
+    starting at offset, or None if unknown"""
+    if response is None:
+        return None
+    content_range = response.headers.get('Content-Range', '')
+    total = content_range.rpartition('/')[2]
+    if total.isdigit():
+        return int(total)
+    length = response.headers.get('Content-Length')
+    if length is None or not length.isdigit():
+        return None
+    if response.status_code == 206:
+        return offset + int(length)
+    return int(length)
+
+
+class LazySchemaDict(Mapping):
+    """The schema of a JSON object. Keys ending in `_url` are exposed without
+    the suffix as resources to follow, nested objects as resources and lists
+    as LazySchemaLists. Values are only built the first time they are read,
+    the decoded JSON is kept in `data`.
+    """
+
+    __slots__ = ('session', 'resource_class', 'data', '_names', '_values')
+
+    def __init__(self, session, resource_class, data):
+        self.session = session
+        self.resource_class = resource_class
+        self.data = data
+        self._names = None
+        self._values = {}
+
+    @property
+    def names(self):
+        """Mapping of the schema keys to the JSON keys they come from"""
+        if self._names is None:
+            self._names = {key.split('_url')[0]: key for key in self.data}
+        return self._names
 
-        return Resource(self.session, response=response,
-                        name=humanize(self.name))
+    def __getitem__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            key = self.names[name]
+            value = self._values[name] = self.parse_value(key, self.data[key])
+            return value
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def parse_value(self, key, value):
+        """Convert the JSON value of key into its schema value"""
+        name = key.split('_url')[0]
+        if key.endswith('_url'):
+            if value:
+                return self.resource_class(self.session, url=value,
+                                           name=humanize(name))
+            return value
+
+        data_type = type(value)
+        if data_type == dict:
+            return self.resource_class(self.session, schema=value,
+                                       name=humanize(name))
+        elif data_type == list:
+            return LazySchemaList(self.session, self.resource_class, value,
+                                  name)
+        return value
+
+
+class LazySchemaList(Sequence):
+    """The schema of a JSON array, whose items are wrapped in resources the
+    first time they are read. The decoded JSON is kept in `data`.
+    """
+
+    __slots__ = ('session', 'resource_class', 'data', 'name', '_item_name',
+                 '_items')
+
+    def __init__(self, session, resource_class, data, name):
+        self.session = session
+        self.resource_class = resource_class
+        self.data = data
+        self.name = name
+        self._item_name = None
+        self._items = [None] * len(data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.data)))]
+
+        item = self._items[index]
+        if item is None:
+            if self._item_name is None:
+                self._item_name = item_name(self.name)
+            item = self._items[index] = self.resource_class(
+                self.session, schema=self.data[index], name=self._item_name)
+        return item
+
+    def __iter__(self):
+        for index in range(len(self.data)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return repr(list(self))
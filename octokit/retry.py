@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.retry
+~~~~~~~~~~~~~
+
+This module contains the retry policy for transient errors. When one is
+handed to the client, requests failing with a 5xx status, a secondary rate
+limit or a connection error are sent again after a backoff:
+
+>>> client = octokit.Client(retry=octokit.retry.RetryPolicy(max_attempts=5))
+"""
+
+import random
+import threading
+import time
+
+import requests
+
+from .exceptions import Error, ServerError
+
+# Methods which may safely be sent more than once
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+
+def is_secondary_rate_limit(error):
+    """Whether error was caused by GitHub's secondary rate limits"""
+    response = error.response
+    if response is None or response.status_code not in (403, 429):
+        return False
+    if 'Retry-After' in response.headers:
+        return True
+    message = str(error.message).lower()
+    return 'secondary rate limit' in message or 'abuse' in message
+
+
+class RetryPolicy(object):
+    """Retries idempotent requests with jittered exponential backoff.
+
+    max_attempts   - Maximum number of times a request is sent.
+    methods        - HTTP methods which are retried.
+    backoff_factor - The n-th retry waits up to backoff_factor * 2 ** (n - 1)
+                     seconds, picked at random ("full jitter").
+    max_backoff    - Maximum wait between two attempts.
+    total_timeout  - Give up once retrying would exceed this many seconds
+                     since the first attempt.
+    clock/sleep    - Time functions, replaceable for testing.
+
+    Retry-After headers, sent with 503s and secondary rate limits, take
+    precedence over the backoff. `retries` and `give_ups` count the retries
+    made and the requests which failed after being retried.
+    """
+
+    def __init__(self, max_attempts=5, methods=IDEMPOTENT_METHODS,
+                 backoff_factor=0.5, max_backoff=60, total_timeout=300,
+                 clock=time.time, sleep=time.sleep):
+        self.max_attempts = max_attempts
+        self.methods = methods
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.total_timeout = total_timeout
+        self.clock = clock
+        self.sleep = sleep
+
+        self.retries = 0
+        self.give_ups = 0
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self):
+        """The retry counters as a dictionary"""
+        return {'retries': self.retries, 'give_ups': self.give_ups}
+
+    def is_retryable(self, method, error):
+        """Whether a request failing with error may be retried"""
+        if method not in self.methods:
+            return False
+        if isinstance(error, ServerError):
+            return True
+        if isinstance(error, Error):
+            return is_secondary_rate_limit(error)
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def backoff(self, attempt, error):
+        """Return how long to wait before the given retry attempt"""
+        response = getattr(error, 'response', None)
+        if response is not None and 'Retry-After' in response.headers:
+            try:
+                return float(response.headers['Retry-After'])
+            except ValueError:
+                pass
+
+        ceiling = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+    def send(self, send, request):
+        """Send a prepared request with send, retrying on transient errors,
+        and return its response."""
+        deadline = self.clock() + self.total_timeout
+        attempt = 0
+        while True:
+            attempt_request = request.copy()
+            attempt_request.hooks = {
+                event: list(hooks) for event, hooks in request.hooks.items()
+            }
+            try:
+                return send(attempt_request)
+            except (Error, requests.RequestException) as error:
+                if not self.is_retryable(request.method, error):
+                    raise
+
+                delay = self.backoff(attempt, error)
+                attempt += 1
+                if (attempt >= self.max_attempts or
+                        self.clock() + delay > deadline):
+                    with self._lock:
+                        self.give_ups += 1
+                    raise
+
+            with self._lock:
+                self.retries += 1
+            self.sleep(delay)
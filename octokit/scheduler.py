@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.scheduler
+~~~~~~~~~~~~~~~~~
+
+This module contains the rate limit scheduler. When one is handed to the
+client, every request first waits for its turn:
+
+>>> client = octokit.Client(scheduler=octokit.scheduler.RateLimitScheduler())
+
+The requests of each token are spread evenly over what's left of its rate
+limit window, callers sleep until the reset once the limit is spent, and
+secondary rate limits are waited out according to their Retry-After header,
+instead of sending requests bound to be rejected.
+"""
+
+import threading
+import time
+
+from .utils import auth_identity
+
+
+class _Budget(object):
+    """What's known of the rate limit of a single token."""
+
+    __slots__ = ('remaining', 'resets_at', 'retry_at', 'next_slot')
+
+    def __init__(self):
+        self.remaining = None
+        self.resets_at = None
+        self.retry_at = 0
+        self.next_slot = 0
+
+
+class RateLimitScheduler(object):
+    """Paces the requests of every token according to its rate limit.
+
+    reserve        - Number of requests of each window left unused, for
+                     other clients sharing the token.
+    clock/sleep    - Time functions, replaceable for testing.
+    """
+
+    def __init__(self, reserve=0, clock=time.time, sleep=time.sleep):
+        self.reserve = reserve
+        self.clock = clock
+        self.sleep = sleep
+        self._budgets = {}
+        self._lock = threading.Lock()
+
+    def budget(self, identity):
+        """Return the budget of the token with the given identity"""
+        with self._lock:
+            return self._budgets.setdefault(identity, _Budget())
+
+    def delay(self, identity):
+        """Return how long a request of the given token has to wait, and
+        whether a slot was reserved for it. Waits for a reset or Retry-After
+        don't reserve a slot, the budget is computed again after them."""
+        now = self.clock()
+        with self._lock:
+            budget = self._budgets.setdefault(identity, _Budget())
+
+            if budget.retry_at > now:
+                return budget.retry_at - now, False
+
+            if budget.resets_at is None or budget.remaining is None:
+                return 0, True
+
+            if budget.resets_at <= now:
+                # A new window has started, its budget is unknown until the
+                # next response.
+                budget.remaining = None
+                budget.next_slot = now
+                return 0, True
+
+            available = budget.remaining - self.reserve
+            if available <= 0:
+                return budget.resets_at - now, False
+
+            interval = (budget.resets_at - now) / float(available)
+            slot = max(now, budget.next_slot)
+            budget.next_slot = slot + interval
+            budget.remaining -= 1
+            return slot - now, True
+
+    def acquire(self, identity):
+        """Block until a request of the given token may be sent"""
+        while True:
+            wait, reserved = self.delay(identity)
+            if wait > 0:
+                self.sleep(wait)
+            if reserved:
+                return
+
+    def schedule(self, request):
+        """Block until a prepared request may be sent, and have its response
+        update the budget of its token."""
+        identity = auth_identity(request)
+        self.acquire(identity)
+
+        def update(response, **kwargs):
+            self.update(identity, response)
+
+        # Run before the client's hook, which raises on error statuses
+        request.hooks['response'].insert(0, update)
+
+    def update(self, identity, response):
+        """Record the rate limit headers of a response of the given token"""
+        headers = response.headers
+        now = self.clock()
+        with self._lock:
+            budget = self._budgets.setdefault(identity, _Budget())
+
+            if 'X-RateLimit-Remaining' in headers:
+                budget.remaining = int(headers['X-RateLimit-Remaining'])
+            if 'X-RateLimit-Reset' in headers:
+                budget.resets_at = int(headers['X-RateLimit-Reset'])
+
+            if response.status_code in (403, 429):
+                retry_after = headers.get('Retry-After')
+                try:
+                    delay = None if retry_after is None else int(retry_after)
+                except ValueError:
+                    # An HTTP date, wait for the reset instead
+                    if budget.resets_at:
+                        budget.retry_at = budget.resets_at
+                else:
+                    if delay is not None:
+                        budget.retry_at = now + delay
+                    elif budget.remaining == 0 and budget.resets_at:
+                        budget.retry_at = budget.resets_at
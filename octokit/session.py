@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.session
+~~~~~~~~~~~~~~~
+
+This module contains the connection pool the clients' sessions are built on.
+Every client gets a Session of its own, so that auth, headers and hooks are
+never shared, but sessions can share one ConnectionPool:
+
+>>> pool = octokit.session.ConnectionPool(maxsize=50)
+>>> clients = [octokit.Client(pool=pool, auth=token) for token in tokens]
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+
+class ConnectionPool(object):
+    """A thread-safe pool of keep-alive HTTP connections.
+
+    connections    - Number of hosts to keep connection pools for.
+    maxsize        - Maximum number of connections kept per host.
+    max_retries    - Retries of failed connections and, for idempotent
+                     methods, failed reads.
+    backoff_factor - Sleep backoff_factor * 2 ** (retry - 1) between retries.
+    keep_alive     - Whether to reuse connections between requests.
+    """
+
+    def __init__(self, connections=10, maxsize=10, max_retries=0,
+                 backoff_factor=0, keep_alive=True):
+        self.keep_alive = keep_alive
+        self.adapter = HTTPAdapter(
+            pool_connections=connections,
+            pool_maxsize=maxsize,
+            max_retries=Retry(total=max_retries,
+                              backoff_factor=backoff_factor),
+        )
+
+    def mount(self, session):
+        """Make session send its HTTP(S) requests through this pool"""
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def session(self):
+        """Return a new Session sending its requests through this pool"""
+        return self.mount(requests.Session())
+
+    def close(self):
+        """Close the idle connections of the pool"""
+        self.adapter.close()
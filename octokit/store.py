@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.store
+~~~~~~~~~~~~~
+
+This module contains the persistent response store, a cache which keeps the
+decoded payloads of responses on disk so that restarted processes start warm:
+
+>>> client = octokit.Client(cache=octokit.store.ResponseStore('octokit.db'))
+
+Responses younger than the store's `ttl` are served without any request,
+older ones are revalidated with their ETag/Last-Modified like with the
+caches of `octokit.cache`. Payloads are stored marshalled, so a warm read
+doesn't decode JSON either.
+"""
+
+import json
+import marshal
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.hooks import dispatch_hook
+from requests.structures import CaseInsensitiveDict
+
+from .cache import (
+    CACHED_HEADERS, Cache, ValidatedEntry, cache_key, has_validators
+)
+from .decoding import decode_response
+
+
+class StoredResponse(requests.Response):
+    """A 200 response rebuilt from the store. The payload is already decoded,
+    its body is only encoded back to JSON if read."""
+
+    def __init__(self, request, entry):
+        super(StoredResponse, self).__init__()
+        self.status_code = 200
+        self.reason = 'OK'
+        self.url = request.url
+        self.request = request
+        self.encoding = 'utf-8'
+        self.headers = CaseInsensitiveDict(entry.headers)
+        self.from_cache = True
+        self._octokit_data = entry.data
+
+    @property
+    def content(self):
+        if self._content is False:
+            data = self._octokit_data
+            self._content = b'' if data is None else \
+                json.dumps(data).encode('utf-8')
+        return self._content
+
+
+class StoreEntry(ValidatedEntry):
+    """The validators, headers and decoded payload stored for a single URL."""
+
+    __slots__ = ('data', 'stored_at')
+
+    def __init__(self, etag=None, last_modified=None, headers=None, data=None,
+                 stored_at=0):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers or {}
+        self.data = data
+        self.stored_at = stored_at
+
+    @classmethod
+    def from_response(cls, response, stored_at):
+        """Build an entry from a response, or None if it isn't JSON"""
+        try:
+            data = decode_response(response)
+        except ValueError:
+            return None
+
+        headers = {
+            k: response.headers[k] for k in CACHED_HEADERS
+            if k in response.headers
+        }
+        return cls(response.headers.get('ETag'),
+                   response.headers.get('Last-Modified'),
+                   headers, data, stored_at)
+
+
+class ResponseStore(Cache):
+    """A response cache persisted in a SQLite database.
+
+    path           - Path of the database, shared by the processes using it.
+    ttl            - Seconds during which a stored response is served
+                     without a request. Past it, the response is
+                     revalidated, which renews it for another ttl.
+    max_bytes      - Bound of the total size of the stored payloads, the
+                     least recently used responses being evicted past it.
+    clock          - Time function, replaceable for testing.
+
+    Entries are keyed by URL, Accept header and token like the other caches.
+    """
+
+    def __init__(self, path, ttl=60, max_bytes=None, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS store ('
+                ' key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,'
+                ' headers TEXT, payload BLOB, stored_at REAL,'
+                ' size INTEGER, accessed INTEGER NOT NULL DEFAULT 0)'
+            )
+            # Keeps MAX(accessed) from scanning the table on every access
+            self._db.execute('CREATE INDEX IF NOT EXISTS store_accessed'
+                             ' ON store (accessed)')
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM store').fetchone()[0]
+
+    @property
+    def size(self):
+        """Total size of the stored payloads in bytes"""
+        with self._lock:
+            return self._db.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM store').fetchone()[0]
+
+    def get(self, key):
+        with self._lock, self._db:
+            row = self._db.execute(
+                'SELECT etag, last_modified, headers, payload, stored_at'
+                ' FROM store WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                'UPDATE store SET accessed ='
+                ' (SELECT MAX(accessed) + 1 FROM store) WHERE key = ?',
+                (key,))
+
+        etag, last_modified, headers, payload, stored_at = row
+        return StoreEntry(etag, last_modified, json.loads(headers),
+                          marshal.loads(payload), stored_at)
+
+    def set(self, key, entry):
+        payload = marshal.dumps(entry.data)
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO store VALUES (?, ?, ?, ?, ?, ?, ?,'
+                ' (SELECT COALESCE(MAX(accessed), 0) + 1 FROM store))',
+                (key, entry.etag, entry.last_modified,
+                 json.dumps(entry.headers), sqlite3.Binary(payload),
+                 entry.stored_at, len(payload)))
+            if self.max_bytes is not None:
+                self._evict()
+
+    def _evict(self):
+        total = self._db.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM store').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        rows = self._db.execute(
+            'SELECT key, size FROM store ORDER BY accessed')
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._db.executemany('DELETE FROM store WHERE key = ?', evicted)
+
+    def touch(self, key, stored_at):
+        """Renew the entry stored under key after a revalidation"""
+        with self._lock, self._db:
+            self._db.execute('UPDATE store SET stored_at = ? WHERE key = ?',
+                             (stored_at, key))
+
+    def delete(self, key):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM store WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM store')
+
+    def close(self):
+        self._db.close()
+
+    def is_fresh(self, entry):
+        """Whether entry may be served without revalidation"""
+        return bool(self.ttl) and self.clock() - entry.stored_at < self.ttl
+
+    def lookup(self, request):
+        if has_validators(request):
+            return None
+
+        entry = self.get(cache_key(request))
+        if entry is None or not self.is_fresh(entry):
+            # Kept for send to revalidate without reading it again
+            request._octokit_entry = entry
+            return None
+
+        response = StoredResponse(request, entry)
+        return dispatch_hook('response', request.hooks, response)
+
+    def entry_from_response(self, response):
+        return StoreEntry.from_response(response, self.clock())
+
+    def not_modified(self, key, entry, request, response):
+        self.touch(key, self.clock())
+        stored = StoredResponse(request, entry)
+        stored.headers.update(response.headers)
+        stored.elapsed = response.elapsed
+        return stored
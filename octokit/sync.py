@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.sync
+~~~~~~~~~~~~
+
+This module contains incremental synchronization of listings. Each run only
+yields the items created or updated since the previous one, by remembering a
+high-water mark between runs:
+
+>>> store = octokit.sync.FileStateStore('sync-state.json')
+>>> sync = octokit.sync.IncrementalSync(client, store,
+...                                     resource=client.repository_issues,
+...                                     owner='octokit', repo='octokit.py',
+...                                     params={'state': 'all'})
+>>> for issue in sync:
+...     index(issue)
+
+The high-water mark is the latest `updated_at` seen, sent back as `since`,
+and when the filtered listing fits in a single page its ETag makes runs that
+find no change cost a 304.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+from .compat import replace
+
+
+class StateStore(object):
+    """Base class of the stores keeping the state of synchronizations."""
+
+    def load(self, key):
+        """Return the state stored under key, or None"""
+        raise NotImplementedError
+
+    def save(self, key, state):
+        """Store state, a dictionary of JSON values, under key"""
+        raise NotImplementedError
+
+
+class FileStateStore(StateStore):
+    """Keeps states in a JSON file, replaced atomically on every save."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, OSError):
+            return {}
+
+    def load(self, key):
+        with self._lock:
+            return self._read().get(key)
+
+    def save(self, key, state):
+        with self._lock:
+            states = self._read()
+            states[key] = state
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(states, f)
+            replace(tmp, self.path)
+
+
+class SQLiteStateStore(StateStore):
+    """Keeps states in a SQLite database."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS sync_state'
+                             ' (key TEXT PRIMARY KEY, state TEXT)')
+
+    def load(self, key):
+        with self._lock:
+            row = self._db.execute('SELECT state FROM sync_state'
+                                   ' WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, key, state):
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO sync_state VALUES (?, ?)',
+                             (key, json.dumps(state)))
+
+    def close(self):
+        self._db.close()
+
+
+class IncrementalSync(object):
+    """Iterates over the items of a listing changed since the last run.
+
+    client         - The Client making the requests.
+    store          - StateStore persisting the high-water mark.
+    resource       - Resource of the listing, the client itself by default.
+    key            - Key of the state in the store, derived from the
+                     resource URL and arguments by default.
+    since_param    - Query parameter taking the high-water mark, or None for
+                     listings without one, which are then filtered here.
+    updated_field  - Item field holding its last update timestamp.
+    id_field       - Item field identifying it.
+    **kwargs       - Arguments of the listing, as given to iter_pages.
+
+    The new state is saved once the iteration is exhausted, so an interrupted
+    run is simply done again. A run answered by a 304 yields nothing, which
+    is only risked for single-page listings filtered by since_param.
+    """
+
+    def __init__(self, client, store, resource=None, key=None,
+                 since_param='since', updated_field='updated_at',
+                 id_field='id', **kwargs):
+        self.client = client
+        self.store = store
+        self.resource = client if resource is None else resource
+        self.since_param = since_param
+        self.updated_field = updated_field
+        self.id_field = id_field
+        self.kwargs = kwargs
+        if key is None:
+            key = '%s %s' % (self.resource.url, json.dumps(
+                kwargs, sort_keys=True, default=str))
+        self.key = key
+
+    def __iter__(self):
+        state = self.store.load(self.key) or {}
+        since = state.get('since')
+        seen = set(state.get('seen', ()))
+
+        kwargs = dict(self.kwargs)
+        headers = dict(kwargs.pop('headers', None) or {})
+        params = dict(kwargs.pop('params', None) or {})
+        if since and self.since_param:
+            params[self.since_param] = since
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+
+        # The response of the first page itself, rather than the last one
+        # the session saw, which may be another thread's. Request hooks
+        # replace those of the session, so the client's are kept.
+        responses = []
+        hooks = {'response': list(self.client.session.hooks['response']) + [
+            lambda r, *args, **kwargs: responses.append(r)]}
+        pages = self.client.iter_pages(resource=self.resource,
+                                       headers=headers, params=params,
+                                       hooks=hooks, **kwargs)
+        first = next(pages)
+        response = responses[-1] if responses else None
+        if response is not None and response.status_code == 304:
+            return
+
+        high_water, latest = since, set()
+        for page in self._pages(first, pages):
+            for item in page.schema:
+                updated = item[self.updated_field]
+                item_id = item[self.id_field]
+                if since and (updated < since or
+                              (updated == since and item_id in seen)):
+                    continue
+
+                if high_water is None or updated > high_water:
+                    high_water, latest = updated, set()
+                if updated == high_water:
+                    latest.add(item_id)
+                yield item
+
+        # The ETag only applies to the first page as requested this time,
+        # which is requested again only if the high-water mark didn't move.
+        # It only tells that nothing changed when the server filters by the
+        # mark and the listing fits in that page: an update further down an
+        # unfiltered listing leaves the first page as it was.
+        etag = None
+        if high_water == since:
+            latest |= seen
+            if (self.since_param and response is not None and
+                    'next' not in first.rels):
+                etag = response.headers.get('ETag')
+        self.store.save(self.key, {
+            'since': high_water,
+            'seen': sorted(latest),
+            'etag': etag,
+        })
+
+    def _pages(self, first, pages):
+        yield first
+        for page in pages:
+            yield page
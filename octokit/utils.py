@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.utils
+~~~~~~~~~~~~~
+
+This module contains helpers shared by the octokit.py modules.
+"""
+
+import hashlib
+
+import uritemplate
+
+from .compat import lru_cache
+
+
+def auth_identity(request):
+    """Return a digest identifying the credentials a prepared request is sent
+    with, or an empty string for anonymous requests."""
+    auth = request.headers.get('Authorization', '')
+    if not auth:
+        return ''
+    return hashlib.sha1(auth.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def compile_template(url):
+    """Return the compiled URITemplate of url.
+
+    Hypermedia URLs such as `repository_url{/owner}{/repo}` repeat across
+    responses, so compiled templates are cached process-wide. The cache is
+    bounded and thread-safe.
+    """
+    return uritemplate.URITemplate(url)
@@ -11,12 +11,16 @@ emails = ''
 package = []
 requires = [
   "requests <= 2.7.0",
-  "uritemplate >= 0.5",
+  "uritemplate >= 3.0",
   "inflection >= 0.3.1",
   "requests-mock >= 0.6.0",
   "nose >= 1.3.7",
   "betamax >= 0.5.0",
+  "futures >= 3.0; python_version < '3.2'",
 ]
+extras = {
+  "async": ["aiohttp >= 3.0"],
+}
 
 setup(
   name='octokit',
@@ -28,5 +32,6 @@ setup(
   url='https://github.com/octokit/octokit.py',
   packages=package,
   install_requires=requires,
+  extras_require=extras,
   license='MIT',
 )
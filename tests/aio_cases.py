@@ -0,0 +1,104 @@
+"""Tests of octokit/aio.py, kept out of test_aio.py as their syntax needs
+Python 3.6"""
+
+import json
+import threading
+import unittest
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+try:
+    import asyncio
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+import octokit
+
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    """Serves a tiny GitHub-shaped API from memory"""
+
+    def do_GET(self):
+        base = 'http://%s:%d' % self.server.server_address
+        headers = {
+            'X-RateLimit-Remaining': '56',
+            'X-RateLimit-Reset': '1446804464',
+            'X-RateLimit-Limit': '60',
+        }
+        status = 200
+
+        if self.path == '/':
+            body = {'user_url': base + '/users/{user}'}
+        elif self.path == '/users/octocat':
+            body = {'login': 'octocat', 'repos_url': base + '/repos'}
+        elif self.path == '/repos?per_page=100':
+            body = [{'name': 'a'}, {'name': 'b'}]
+            headers['Link'] = '<%s/repos?page=2>; rel="next"' % base
+        elif self.path == '/repos?page=2':
+            body = [{'name': 'c'}]
+        else:
+            status, body = 404, {'message': 'Not Found'}
+
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncClient(unittest.TestCase):
+    """Tests the functionality in octokit/aio.py"""
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), MockGitHubHandler)
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  kwargs={'poll_interval': 0.01})
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.endpoint = 'http://%s:%d/' % self.server.server_address
+
+    def run_async(self, coroutine):
+        async def run():
+            async with octokit.AsyncClient(api_endpoint=self.endpoint) as c:
+                return await coroutine(c)
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+    def test_get(self):
+        async def get_user(client):
+            return await client.user('octocat')
+
+        user = self.run_async(get_user)
+        self.assertEqual(user.login, 'octocat')
+        self.assertIsInstance(user.repos, octokit.aio.AsyncResource)
+
+    def test_paginate(self):
+        async def list_repos(client):
+            user = await client.user('octocat')
+            return [repo.schema['name'] async for repo
+                    in client.paginate(resource=user.repos)]
+
+        self.assertEqual(self.run_async(list_repos), ['a', 'b', 'c'])
+
+    def test_exceptions(self):
+        async def get_missing(client):
+            return await client.user('missing')
+
+        with self.assertRaises(octokit.exceptions.NotFound):
+            self.run_async(get_missing)
@@ -0,0 +1,8 @@
+import sys
+import unittest
+
+if sys.version_info >= (3, 6):
+    from .aio_cases import TestAsyncClient  # noqa: F401
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+import requests_mock
+
+import octokit
+
+
+class TestBatch(unittest.TestCase):
+    """Tests the functionality in octokit/batch.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}')
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        for name in 'abcde':
+            self.adapter.register_uri('GET', 'mock://api.com/' + name,
+                                      text='{"name": "%s"}' % name)
+        self.adapter.register_uri('GET', 'mock://api.com/missing',
+                                  status_code=404)
+
+    def test_fetch_many(self):
+        """Test that results come back in order, errors included."""
+        requests = [{'param': name} for name in 'abcde']
+        requests.insert(2, (self.client, ('missing',)))
+
+        results = self.client.fetch_many(requests, concurrency=3)
+
+        self.assertIsInstance(results[2], octokit.exceptions.NotFound)
+        del results[2]
+        self.assertEqual([r['name'] for r in results], list('abcde'))
+        self.assertEqual(self.adapter.call_count, 6)
+
+    def test_rate_limit(self):
+        """Test that no more requests than the rate limit are in flight."""
+        self.client.rate_limit.remaining = 1
+        self.assertEqual(self.client.batch_slots(8, {}), 1)
+        self.client.rate_limit.remaining = 100
+        self.assertEqual(self.client.batch_slots(8, {}), 8)
+
+if __name__ == '__main__':
+    unittest.main()
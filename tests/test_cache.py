@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests
+import requests_mock
+
+import octokit
+from octokit.cache import MemoryCache, SQLiteCache
+
+
+class TestCache(unittest.TestCase):
+    """Tests the functionality in octokit/cache.py"""
+
+    def setUp(self):
+        self.cache = MemoryCache()
+        self.client = octokit.Client(api_endpoint='mock://api.com/repo',
+                                     session=requests.Session(),
+                                     cache=self.cache)
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+
+    def register_responses(self):
+        headers = {
+            'ETag': '"abc"',
+            'Link': '<mock://api.com/repo?page=2>; rel="next"',
+        }
+        self.adapter.register_uri('GET', self.client.url, [
+            {'text': '{"name": "octokit.py"}', 'headers': headers},
+            {'status_code': 304, 'headers': {'ETag': '"abc"'}},
+        ])
+
+    def test_not_modified(self):
+        """Test that a 304 rebuilds the resource from the cached body."""
+        self.register_responses()
+
+        self.client.get()
+        second = self.client.get()
+
+        last_request = self.adapter.last_request
+        self.assertEqual(last_request.headers['If-None-Match'], '"abc"')
+        self.assertEqual(second['name'], 'octokit.py')
+        self.assertIn('next', second.rels)
+
+    def test_caller_validators(self):
+        """Test that requests with their own validators bypass the cache."""
+        self.register_responses()
+        self.client.get()
+
+        response = self.cache.send(
+            self.client.session,
+            self.client.session.prepare_request(requests.Request(
+                'GET', self.client.url, headers={'If-None-Match': '"abc"'}
+            ))
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        for key in 'abc':
+            cache.set(key, key)
+        cache.get('b')
+        cache.set('d', 'd')
+
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual(cache.get('b'), 'b')
+
+    def test_sqlite(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.client.session.cache = SQLiteCache(
+            os.path.join(tmpdir, 'cache.db'))
+        self.register_responses()
+
+        self.client.get()
+        response = self.client.get()
+
+        self.assertEqual(response['name'], 'octokit.py')
+        self.assertEqual(len(self.client.session.cache), 1)
+        self.client.session.cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
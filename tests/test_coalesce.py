@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.coalesce import SingleFlight
+
+
+class TestCoalesce(unittest.TestCase):
+    """Tests the functionality in octokit/coalesce.py"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.coalesce = SingleFlight(clock=lambda: self.now)
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}',
+                                     coalesce=self.coalesce)
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+
+    def register_slow(self, body='{"name": "octokit.py"}', **kwargs):
+        def slow(request, context):
+            time.sleep(0.1)
+            return body
+        self.adapter.register_uri('GET', 'mock://api.com/foo', text=slow,
+                                  **kwargs)
+
+    def fetch_concurrently(self, count=5, **kwargs):
+        results = [None] * count
+        start = threading.Event()
+
+        def fetch(index):
+            start.wait()
+            try:
+                results[index] = self.client.get(param='foo', **kwargs)
+            except Exception as error:
+                results[index] = error
+
+        threads = [threading.Thread(target=fetch, args=(i,))
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalesce(self):
+        """Test that concurrent identical GETs share one request."""
+        self.register_slow()
+
+        results = self.fetch_concurrently()
+        self.assertEqual(self.adapter.call_count, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(results[0]['name'], 'octokit.py')
+        self.assertEqual(self.coalesce.metrics, {'requests': 1, 'shared': 4})
+
+        # Nothing is kept once the request completed
+        self.client.get(param='foo')
+        self.assertEqual(self.adapter.call_count, 2)
+
+    def test_error(self):
+        """Test that every waiter gets the exception of the request."""
+        self.register_slow('{"message": "Not Found"}', status_code=404)
+
+        results = self.fetch_concurrently()
+        self.assertEqual(self.adapter.call_count, 1)
+        self.assertIsInstance(results[0], octokit.exceptions.NotFound)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_key(self):
+        """Test that requests differing by token or fields aren't shared."""
+        self.adapter.register_uri('GET', 'mock://api.com/foo',
+                                  text='{"name": "octokit.py"}')
+        self.coalesce.window = 60
+
+        self.client.get(param='foo')
+        self.client.get(param='foo', fields=['name'])
+        self.client.session.auth = ('octocat', 'token')
+        self.client.get(param='foo')
+        self.client.get(param='foo')
+        self.assertEqual(self.adapter.call_count, 3)
+
+    def test_window(self):
+        """Test that results are reused during the freshness window."""
+        self.adapter.register_uri('GET', 'mock://api.com/foo',
+                                  text='{"name": "octokit.py"}')
+        self.coalesce.window = 5
+
+        first = self.client.get(param='foo')
+        self.now += 4
+        self.assertIs(self.client.get(param='foo'), first)
+        self.now += 2
+        self.assertIsNot(self.client.get(param='foo'), first)
+        self.assertEqual(self.adapter.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import json
+import multiprocessing
+import os
+import threading
+import unittest
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+import octokit
+from octokit.crawl import CrawlExecutor, SharedRateLimitLedger, get_context
+
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    """Serves the issues of a couple of repositories from memory"""
+
+    def do_GET(self):
+        base = 'http://%s:%d' % self.server.server_address
+        headers = {}
+        status = 200
+
+        if self.path == '/repos/octokit/a/issues?per_page=100':
+            body = [{'number': 1, 'title': 'a1'}, {'number': 2, 'title': 'a2'}]
+            headers['Link'] = '<%s/repos/octokit/a/issues?page=2>; ' \
+                'rel="next"' % base
+        elif self.path == '/repos/octokit/a/issues?page=2':
+            body = [{'number': 3, 'title': 'a3'}]
+        elif self.path == '/repos/octokit/b/issues?per_page=100':
+            body = [{'number': 1, 'title': 'b1'}]
+        elif self.path == '/repos/octokit/a':
+            body = {'name': 'a', 'issues_url': base + '/repos/octokit/a/issues'}
+        else:
+            status, body = 404, {'message': 'Not Found'}
+
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def acquire(ledger, identity):
+    ledger.acquire(identity)
+
+
+try:
+    FORK = 'fork' in multiprocessing.get_all_start_methods()
+except AttributeError:  # Python < 3.4
+    FORK = os.name == 'posix'
+
+
+@unittest.skipUnless(FORK, 'fork start method unavailable')
+class TestCrawl(unittest.TestCase):
+    """Tests the functionality in octokit/crawl.py"""
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), MockGitHubHandler)
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  kwargs={'poll_interval': 0.01})
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = 'http://%s:%d' % self.server.server_address
+
+        self.crawl = CrawlExecutor(processes=2, context='fork',
+                                   api_endpoint=self.base + '/')
+        self.addCleanup(self.crawl.close, timeout=5)
+
+    def test_iter_items(self):
+        template = self.base + '/repos/octokit{/repo}/issues'
+        results = self.crawl.iter_items([{'repo': 'a'}, {'repo': 'b'}],
+                                        template=template, fields=['title'])
+        titles = sorted((task['repo'], item['title'])
+                        for task, item in results)
+        self.assertEqual(titles, [
+            ('a', 'a1'), ('a', 'a2'), ('a', 'a3'), ('b', 'b1'),
+        ])
+
+    def test_fetch(self):
+        urls = [self.base + '/repos/octokit/a', self.base + '/missing']
+        results = dict(self.crawl.fetch(urls))
+
+        self.assertEqual(results[urls[0]]['name'], 'a')
+        self.assertIsInstance(results[urls[0]], dict)
+        self.assertIsInstance(results[urls[1]], octokit.exceptions.NotFound)
+
+    def test_dead_worker(self):
+        """Test that a crawl fails rather than hang when a worker dies."""
+        crawl = CrawlExecutor(processes=1, context='fork',
+                              api_endpoint=self.base + '/')
+        self.addCleanup(crawl.close, timeout=5)
+        crawl.start()
+        crawl._workers[0].terminate()
+
+        urls = [self.base + '/repos/octokit/a']
+        self.assertRaises(RuntimeError, list, crawl.fetch(urls))
+
+        # the next crawl starts new workers
+        self.assertEqual(dict(crawl.fetch(urls))[urls[0]]['name'], 'a')
+
+    def test_backpressure(self):
+        """Test that workers wait for room in a bounded results queue."""
+        crawl = CrawlExecutor(processes=2, context='fork', max_pending=1,
+                              api_endpoint=self.base + '/')
+        self.addCleanup(crawl.close, timeout=5)
+        urls = [self.base + '/repos/octokit/a'] * 10
+
+        results = crawl.fetch(urls)
+        first = next(results)
+        self.assertEqual(first[1]['name'], 'a')
+        self.assertEqual(len(list(results)), 9)
+
+    def test_shared_ledger(self):
+        """Test that budgets are shared with the processes of the ledger."""
+        ledger = SharedRateLimitLedger(context='fork')
+        budget = ledger.budget('abc')
+        budget.remaining = 10
+        budget.resets_at = ledger.clock() + 3600
+
+        context = get_context('fork')
+        process = context.Process(target=acquire, args=(ledger, 'abc'))
+        process.start()
+        process.join(5)
+
+        self.assertEqual(ledger.budget('abc').remaining, 9)
+        self.assertIsNone(ledger.budget('other').remaining)
+
+if __name__ == '__main__':
+    unittest.main()
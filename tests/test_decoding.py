@@ -0,0 +1,85 @@
+import json
+import unittest
+
+import requests_mock
+import uritemplate
+
+import octokit
+from octokit import decoding
+
+
+class TestDecoding(unittest.TestCase):
+    """Tests the functionality in octokit/decoding.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}')
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.url = uritemplate.expand(self.client.url, {'param': 'foo'})
+
+        self.decoded = []
+
+        def backend(content):
+            self.decoded.append(content)
+            return json.loads(content.decode('utf-8'))
+
+        decoding.set_backend(backend)
+        self.addCleanup(decoding.set_backend, None)
+
+    def test_decode_once(self):
+        """Test that a body is decoded once per response."""
+        self.adapter.register_uri('GET', self.url, text='{"success": true}')
+
+        response = self.client.get(param='foo')
+        self.assertTrue(response.success)
+        self.assertEqual(len(self.decoded), 1)
+
+    def test_bodiless(self):
+        """Test that responses without body aren't decoded."""
+        self.adapter.register_uri('DELETE', self.url, status_code=204)
+        self.adapter.register_uri('HEAD', self.url)
+
+        self.client.delete(param='foo')
+        self.client.head(param='foo')
+        self.assertEqual(self.decoded, [])
+
+    def test_error(self):
+        """Test that error bodies are decoded for the exception."""
+        self.adapter.register_uri('GET', self.url, status_code=422,
+                                  text='{"message": "Validation Failed"}')
+
+        with self.assertRaises(octokit.exceptions.UnprocessableEntity) as cm:
+            self.client.get(param='foo')
+        self.assertEqual(cm.exception.message, 'Validation Failed')
+        self.assertEqual(len(self.decoded), 1)
+
+    def test_project(self):
+        """Test that bodies are projected onto the requested fields."""
+        self.adapter.register_uri('GET', self.url, text=json.dumps({
+            'number': 1, 'state': 'open', 'title': 'Bug',
+            'user': {'login': 'octocat', 'id': 1},
+            'labels': [{'name': 'bug', 'color': 'fc2929'}],
+            'comments_url': 'mock://api.com/comments',
+        }))
+
+        response = self.client.get(param='foo', fields=[
+            'number', 'user.login', 'labels.name', 'comments_url', 'missing',
+        ])
+        self.assertEqual(sorted(response.schema), [
+            'comments', 'labels', 'number', 'user',
+        ])
+        self.assertEqual(response.user.schema, {'login': 'octocat'})
+        self.assertEqual(response.labels[0].schema, {'name': 'bug'})
+
+    def test_project_paths(self):
+        """Test projecting lists and overlapping paths."""
+        data = [{'a': {'b': 1, 'c': 2}, 'd': 3}, {'d': 4}, 5]
+        self.assertEqual(decoding.project(data, ['a.b', 'd']), [
+            {'a': {'b': 1}, 'd': 3}, {'d': 4}, 5,
+        ])
+        self.assertEqual(decoding.project(data, ['a', 'a.b']), [
+            {'a': {'b': 1, 'c': 2}}, {}, 5,
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+import unittest
+
+import requests_mock
+import uritemplate
+
+import octokit
+from octokit import export
+from octokit.compat import PY2
+
+
+class TestExport(unittest.TestCase):
+    """Tests the functionality in octokit/export.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}')
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.columns = export.Columns([
+            'number', ('author', 'user.login'), 'labels.name', 'milestone.title',
+        ])
+
+    def register_pages(self, pages):
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        for index, items in enumerate(pages):
+            headers = {}
+            if index + 1 < len(pages):
+                headers['Link'] = '<%s?page=%d>; rel="next"' % (url, index + 2)
+            self.adapter.register_uri(
+                'GET', url + ('?page=%d' % (index + 1) if index else ''),
+                headers=headers, text=json.dumps(items))
+
+    def issue(self, number):
+        return {
+            'number': number, 'title': 'Issue %d' % number,
+            'user': {'login': 'octocat', 'id': 1},
+            'labels': [{'name': 'bug'}, {'name': 'ui'}] if number % 2 else [],
+        }
+
+    def test_extract(self):
+        item = self.issue(1)
+        self.assertEqual(export.extract(item, ('user', 'login')), 'octocat')
+        self.assertEqual(export.extract(item, ('labels', 'name')),
+                         ['bug', 'ui'])
+        self.assertIsNone(export.extract(item, ('milestone', 'title')))
+        self.assertIsNone(export.extract(item, ('title', 'length')))
+
+    def test_iter_batches(self):
+        """Test that batches hold at most batch_rows rows, across pages."""
+        self.register_pages([[self.issue(n) for n in range(p * 3, p * 3 + 3)]
+                             for p in range(3)])
+        pages = self.client.iter_pages(param='foo',
+                                       fields=self.columns.fields)
+
+        batches = list(export.iter_batches(pages, self.columns, 4))
+        self.assertEqual([len(b) for b in batches], [4, 4, 1])
+        self.assertEqual(batches[0].values[0], [0, 1, 2, 3])
+        self.assertEqual(list(batches[2].rows()),
+                         [(8, 'octocat', [], None)])
+
+    def test_csv(self):
+        self.register_pages([[self.issue(1), self.issue(2)], [self.issue(3)]])
+        output = io.BytesIO() if PY2 else io.StringIO()
+        pages = self.client.iter_pages(param='foo',
+                                       fields=self.columns.fields)
+
+        with export.CSVWriter(output, self.columns) as writer:
+            rows = export.export(pages, self.columns, writer, batch_rows=2)
+        self.assertEqual(rows, 3)
+        output.seek(0)
+        self.assertEqual(list(csv.reader(output)), [
+            ['number', 'author', 'labels.name', 'milestone.title'],
+            ['1', 'octocat', '["bug", "ui"]', ''],
+            ['2', 'octocat', '[]', ''],
+            ['3', 'octocat', '["bug", "ui"]', ''],
+        ])
+
+    @unittest.skipIf(export.pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        pages = [[self.issue(n) for n in range(p * 2, p * 2 + 2)]
+                 for p in range(2)]
+        output = io.BytesIO()
+
+        pyarrow = export.pyarrow
+
+        writer = export.ParquetWriter(
+            output, self.columns, types={'milestone.title': pyarrow.string()})
+        export.export(pages, self.columns, writer, batch_rows=3)
+        writer.close()
+        output.seek(0)
+        table = pyarrow.parquet.read_table(output)
+        self.assertEqual(table.column('number').to_pylist(), [0, 1, 2, 3])
+        self.assertEqual(table.schema.field('milestone.title').type,
+                         pyarrow.string())
+
+    @unittest.skipIf(export.pyarrow is None, 'pyarrow is not installed')
+    def test_parquet_untyped_column(self):
+        """Test that the type of columns only holding None or empty lists in
+        the first batch is required."""
+        pyarrow = export.pyarrow
+        pages = [[self.issue(0)], [self.issue(1)]]
+        types = {'milestone.title': pyarrow.string()}
+
+        # labels.name is a list<null> in the first batch
+        writer = export.ParquetWriter(io.BytesIO(), self.columns, types=types)
+        with self.assertRaises(ValueError):
+            export.export(pages, self.columns, writer, batch_rows=1)
+
+        output = io.BytesIO()
+        types['labels.name'] = pyarrow.list_(pyarrow.string())
+        with export.ParquetWriter(output, self.columns, types=types) as writer:
+            export.export(pages, self.columns, writer, batch_rows=1)
+        output.seek(0)
+        table = pyarrow.parquet.read_table(output)
+        self.assertEqual(table.column('labels.name').to_pylist(),
+                         [[], ['bug', 'ui']])
+
+if __name__ == '__main__':
+    unittest.main()
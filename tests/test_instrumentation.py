@@ -0,0 +1,159 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests
+import requests_mock
+
+import octokit
+from octokit.cache import MemoryCache
+from octokit.store import ResponseStore
+from octokit.instrumentation import (
+    Instrumentation, LatencyAggregator, RequestEvent
+)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests the functionality in octokit/instrumentation.py"""
+
+    def setUp(self):
+        self.events = []
+        self.instrumentation = Instrumentation()
+        self.instrumentation.subscribe(self.events.append)
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}',
+                                     instrumentation=self.instrumentation)
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+
+    def test_events(self):
+        """Test that requests publish their measurements."""
+        self.adapter.register_uri('GET', 'mock://api.com/foo',
+                                  text='{"success": true}')
+
+        response = self.client.get(param='foo')
+        self.assertTrue(response.success)
+        self.assertEqual(len(self.events), 1)
+
+        event = self.events[0]
+        self.assertEqual(event.method, 'GET')
+        self.assertEqual(event.template, 'mock://api.com/{param}')
+        self.assertEqual(event.url, 'mock://api.com/foo')
+        self.assertEqual(event.status, 200)
+        self.assertEqual(event.bytes, 17)
+        self.assertIsNotNone(event.ttfb)
+        self.assertGreaterEqual(event.latency, 0)
+        self.assertGreaterEqual(event.decode_time, 0)
+        self.assertGreaterEqual(event.parse_time, 0)
+        self.assertIsNone(event.cache)
+        self.assertIsNone(event.error)
+
+    def test_page_template(self):
+        """Test that the literal query string of page URLs is dropped."""
+        self.adapter.register_uri('GET', 'mock://api.com/foo?page=2',
+                                  text='[]')
+        resource = octokit.Resource(self.client.session, name='Foo',
+                                    url='mock://api.com/foo?page=2')
+
+        resource.get()
+        self.assertEqual(self.events[0].template, 'mock://api.com/foo')
+
+    def test_error(self):
+        """Test that failed requests publish an event before raising."""
+        self.adapter.register_uri('GET', 'mock://api.com/foo',
+                                  status_code=404,
+                                  text='{"message": "Not Found"}')
+
+        with self.assertRaises(octokit.exceptions.NotFound) as raised:
+            self.client.get(param='foo')
+        event = self.events[0]
+        self.assertEqual(event.status, 404)
+        self.assertIs(event.error, raised.exception)
+
+    def test_connection_error(self):
+        """Test that requests which got no response publish an event."""
+        self.adapter.register_uri('GET', 'mock://api.com/foo',
+                                  exc=requests.ConnectionError)
+
+        with self.assertRaises(requests.ConnectionError) as raised:
+            self.client.get(param='foo')
+        event = self.events[0]
+        self.assertIsNone(event.status)
+        self.assertIs(event.error, raised.exception)
+        self.assertIsNotNone(event.latency)
+
+    def test_cache(self):
+        """Test that cache hits and misses are reported."""
+        self.client.session.cache = MemoryCache()
+        self.adapter.register_uri('GET', 'mock://api.com/foo', [
+            {'text': '{"success": true}', 'headers': {'ETag': '"abc"'}},
+            {'status_code': 304},
+        ])
+
+        self.client.get(param='foo')
+        self.client.get(param='foo')
+        self.assertEqual([e.cache for e in self.events], ['miss', 'hit'])
+
+    def test_store(self):
+        """Test that the payloads of a ResponseStore aren't encoded back to
+        measure them."""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        store = ResponseStore(os.path.join(tmpdir, 'store.db'))
+        self.addCleanup(store.close)
+        self.client.session.cache = store
+        self.adapter.register_uri('GET', 'mock://api.com/foo',
+                                  text='{"success": true}')
+
+        self.assertTrue(self.client.get(param='foo').success)
+        self.assertTrue(self.client.get(param='foo').success)
+        self.assertEqual([e.cache for e in self.events], ['miss', 'hit'])
+        self.assertEqual(self.events[0].bytes, 17)
+        self.assertIsNone(self.events[1].bytes)
+
+    def test_unsubscribe(self):
+        """Test that unsubscribed callables receive no more events."""
+        self.adapter.register_uri('GET', 'mock://api.com/foo', text='{}')
+        self.instrumentation.unsubscribe(self.events.append)
+
+        self.client.get(param='foo')
+        self.assertEqual(self.events, [])
+
+
+class TestLatencyAggregator(unittest.TestCase):
+    """Tests the functionality in octokit/instrumentation.py"""
+
+    def test_percentiles(self):
+        """Test the percentiles of each endpoint."""
+        aggregator = LatencyAggregator()
+        for i in range(1, 101):
+            event = RequestEvent('GET', 'mock://api.com/{param}', None)
+            event.latency = i / 1000.0
+            aggregator(event)
+        event = RequestEvent('POST', 'mock://api.com/{param}', None)
+        event.latency = 0.5
+        aggregator(event)
+
+        stats = aggregator.percentiles()
+        self.assertEqual(stats[('GET', 'mock://api.com/{param}')], {
+            'count': 100, 'p50': 0.05, 'p95': 0.095, 'p99': 0.099,
+        })
+        self.assertEqual(stats[('POST', 'mock://api.com/{param}')]['p99'],
+                         0.5)
+        self.assertIn('mock://api.com/{param}', aggregator.report())
+
+    def test_max_endpoints(self):
+        """Test that endpoints past max_endpoints are only counted."""
+        aggregator = LatencyAggregator(max_endpoints=2)
+        for url in ('mock://api.com/a', 'mock://api.com/b', 'mock://api.com/c',
+                    'mock://api.com/a'):
+            event = RequestEvent('GET', url, url)
+            event.latency = 0.1
+            aggregator(event)
+
+        stats = aggregator.percentiles()
+        self.assertEqual(sorted(t for _, t in stats), [
+            'mock://api.com/a', 'mock://api.com/b',
+        ])
+        self.assertEqual(stats[('GET', 'mock://api.com/a')]['count'], 2)
+        self.assertEqual(aggregator.dropped, 1)
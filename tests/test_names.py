@@ -0,0 +1,24 @@
+import unittest
+
+import inflection
+
+from octokit import names
+
+
+class TestNames(unittest.TestCase):
+    """Tests the functionality in octokit/names.py"""
+
+    def test_same_as_inflection(self):
+        for key in ('owner', 'pull_request', 'labels', 'received_events'):
+            self.assertEqual(names.humanize(key), inflection.humanize(key))
+            self.assertEqual(names.item_name(key), inflection.humanize(
+                inflection.singularize(key)))
+
+    def test_memoized(self):
+        """Test that common keys are warmed and results are shared."""
+        hits = names.humanize.cache_info().hits
+        self.assertIs(names.humanize('owner'), names.humanize('owner'))
+        self.assertEqual(names.humanize.cache_info().hits, hits + 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,5 +50,86 @@ class TestPagination(unittest.TestCase):
 
         self.assertEqual(resultSchema, expectedSchema)
 
+    def test_iter_items(self):
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        page2 = url + '?page=2&per_page=2'
+
+        rate_limit = {
+            'X-RateLimit-Remaining': '56',
+            'X-RateLimit-Reset': '1446804464',
+            'X-RateLimit-Limit': '60'
+        }
+        h1 = dict(rate_limit, Link='<'+page2+'>; rel="next"')
+        h2 = dict(rate_limit, Link='<'+url+'?page=3&per_page=2>; rel="next"')
+        self.adapter.register_uri('GET', url, headers=h1, text='["a","b"]')
+        self.adapter.register_uri('GET', url+'?page=2', headers=h2,
+                                  text='["c","d"]')
+        self.adapter.register_uri('GET', url+'?page=3', text='["e"]')
+
+        items = self.client.iter_items(param='foo', per_page=2, max_items=3)
+        self.assertEqual([i.schema for i in items], ['a', 'b', 'c'])
+        # stopped in the middle of page 2, so resume from page 2
+        self.assertEqual(items.cursor, page2)
+        self.assertEqual(self.adapter.call_count, 2)
+
+        items = self.client.iter_items(cursor=items.cursor)
+        self.assertEqual([i.schema for i in items], ['c', 'd', 'e'])
+        self.assertIsNone(items.cursor)
+
+    def test_iter_pages_max_pages(self):
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        h1 = {'Link': '<'+url+'?page=2>; rel="next"'}
+        self.adapter.register_uri('GET', url, headers=h1, text='["a","b"]')
+
+        pages = self.client.iter_pages(param='foo', max_pages=1)
+        self.assertEqual(len(list(pages)), 1)
+        self.assertEqual(pages.cursor, url+'?page=2')
+
+    def test_iter_items_fields(self):
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        h1 = {'Link': '<'+url+'?page=2>; rel="next"'}
+        self.adapter.register_uri('GET', url, headers=h1,
+                                  text='[{"number": 1, "title": "a"}]')
+        self.adapter.register_uri('GET', url+'?page=2',
+                                  text='[{"number": 2, "title": "b"}]')
+
+        items = self.client.iter_items(param='foo', fields=['number'])
+        self.assertEqual([dict(i.schema) for i in items],
+                         [{'number': 1}, {'number': 2}])
+
+    def test_prefetch(self):
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        rate_limit = {
+            'X-RateLimit-Remaining': '56',
+            'X-RateLimit-Reset': '1446804464',
+            'X-RateLimit-Limit': '60'
+        }
+        h1 = dict(rate_limit, Link=(
+            '<'+url+'?per_page=2&page=2>; rel="next", '
+            '<'+url+'?per_page=2&page=5>; rel="last"'
+        ))
+        self.adapter.register_uri('GET', url, headers=h1, text='["p1"]')
+        for page in range(2, 6):
+            self.adapter.register_uri(
+                'GET', url+'?page=%d' % page, headers=rate_limit,
+                text='["p%d"]' % page
+            )
+
+        pages = self.client.iter_pages(param='foo', per_page=2,
+                                       prefetch=True, concurrency=3)
+        result = [p.schema[0].schema for p in pages]
+
+        self.assertEqual(result, ['p1', 'p2', 'p3', 'p4', 'p5'])
+        self.assertIsNone(pages.cursor)
+        self.assertEqual(self.adapter.call_count, 5)
+
+    def test_prefetch_slowdown(self):
+        pages = self.client.iter_pages(prefetch=True, concurrency=8)
+        rate_limit = self.client._rate_limit
+
+        for remaining, limit in [(None, 8), (500, 8), (50, 4), (5, 1), (0, 0)]:
+            rate_limit.remaining = remaining
+            self.assertEqual(pages.in_flight_limit(), limit)
+
 if __name__ == '__main__':
     unittest.main()
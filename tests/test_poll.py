@@ -0,0 +1,152 @@
+import json
+import threading
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.poll import Poller
+
+
+class TestPoll(unittest.TestCase):
+    """Tests the functionality in octokit/poll.py"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}')
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.poller = Poller(self.client, interval=10, max_interval=60,
+                             jitter=0, clock=lambda: self.now)
+        self.received = []
+
+    def callback(self, watch, items):
+        self.received.append([item['id'] for item in items])
+
+    def events(self, *ids, **headers):
+        headers.setdefault('ETag', '"%s"' % ids[0])
+        return {'text': json.dumps([{'id': i} for i in ids]),
+                'headers': headers}
+
+    def test_new_items(self):
+        """Test that only the items new since the last poll are handed over,
+        and that polls are conditional."""
+        self.adapter.register_uri('GET', 'mock://api.com/events', [
+            self.events(2, 1),
+            {'status_code': 304, 'headers': {'ETag': '"2"'}},
+            self.events(4, 3, 2),
+        ])
+        watch = self.poller.watch(None, self.callback, param='events')
+
+        self.assertEqual(self.poller.run_pending(), 1)
+        self.assertEqual(self.received, [])
+        self.assertEqual(watch.next_due, 10)
+
+        self.now = 10
+        self.assertEqual(self.poller.run_pending(), 1)
+        self.assertEqual(self.adapter.last_request.headers['If-None-Match'],
+                         '"2"')
+        self.assertEqual(self.received, [])
+
+        self.now = 30
+        self.poller.run_pending()
+        self.assertEqual(self.received, [[4, 3]])
+        self.assertEqual(watch.etag, '"4"')
+        self.assertEqual(watch.polls, 3)
+
+    def test_intervals(self):
+        """Test that idle resources back off, never polling more often than
+        X-Poll-Interval asks."""
+        self.adapter.register_uri('GET', 'mock://api.com/events', [
+            self.events(1, **{'X-Poll-Interval': '15'}),
+            {'status_code': 304},
+        ])
+        watch = self.poller.watch(None, self.callback, param='events')
+
+        delays = []
+        for _ in range(5):
+            self.now = watch.next_due
+            self.poller.run_pending()
+            delays.append(watch.next_due - self.now)
+        self.assertEqual(delays, [15, 20, 40, 60, 60])
+
+    def test_idle_backoff(self):
+        """Test that the idle count stops growing at max_interval, so that
+        fractional backoffs never overflow."""
+        poller = Poller(self.client, interval=10, max_interval=60,
+                        backoff=1.5, jitter=0)
+        watch = poller.watch(None, self.callback, param='events')
+        for _ in range(5000):
+            delay = poller.next_delay(watch, False)
+        self.assertEqual(delay, 60)
+        self.assertEqual(watch.idle, 5)
+
+    def test_error(self):
+        """Test that failed polls are reported and tried again later."""
+        errors = []
+        self.poller.on_error = lambda watch, error: errors.append(error)
+        self.adapter.register_uri('GET', 'mock://api.com/events', [
+            {'status_code': 500, 'text': '{"message": "Server Error"}'},
+            self.events(1),
+            self.events(2, 1),
+        ])
+        watch = self.poller.watch(None, self.callback, param='events')
+
+        self.poller.run_pending()
+        self.assertIsInstance(errors[0], octokit.exceptions.ServerError)
+        self.assertIs(watch.error, errors[0])
+        self.assertEqual(watch.polls, 0)
+
+        for _ in range(2):
+            self.now = watch.next_due
+            self.poller.run_pending()
+        self.assertIsNone(watch.error)
+        self.assertEqual(self.received, [[2]])
+
+    def test_error_callback_raises(self):
+        """Test that a watch is polled again even if on_error raises."""
+        def on_error(watch, error):
+            raise RuntimeError('on_error failed')
+        self.poller.on_error = on_error
+        self.adapter.register_uri('GET', 'mock://api.com/events',
+                                  status_code=500,
+                                  text='{"message": "Server Error"}')
+        watch = self.poller.watch(None, self.callback, param='events')
+
+        self.assertRaises(RuntimeError, self.poller.run_pending)
+        self.assertEqual(watch.next_due, 10)
+        self.assertEqual(len(self.poller), 1)
+
+    def test_unwatch(self):
+        self.adapter.register_uri('GET', 'mock://api.com/events',
+                                  **self.events(1))
+        watch = self.poller.watch(None, self.callback, param='events')
+        self.poller.unwatch(watch)
+
+        self.assertEqual(self.poller.run_pending(), 0)
+        self.assertEqual(self.adapter.call_count, 0)
+
+    def test_run(self):
+        """Test that the worker pool polls every watch."""
+        done = threading.Event()
+        received = set()
+
+        def callback(watch, items):
+            received.add(watch.kwargs['param'])
+            if len(received) == 20:
+                done.set()
+
+        for index in range(20):
+            self.adapter.register_uri('GET', 'mock://api.com/r%d' % index,
+                                      **self.events(index))
+        poller = Poller(self.client, workers=4, initial=True)
+        for index in range(20):
+            poller.watch(None, callback, param='r%d' % index)
+
+        with poller:
+            self.assertTrue(done.wait(5))
+        self.assertEqual(self.adapter.call_count, 20)
+        self.assertEqual(len(poller), 20)
+
+if __name__ == '__main__':
+    unittest.main()
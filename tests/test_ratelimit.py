@@ -50,5 +50,49 @@ class TestRateLimit(unittest.TestCase):
 
         self.assertEqual(resultSchema, expectedSchema)
 
+    def test_no_request(self):
+        """Test that reading the rate limit never makes a request."""
+        rate_limit = self.client.rate_limit
+        self.assertIsNone(rate_limit.remaining)
+        self.assertIsNone(rate_limit.resets_in)
+        self.assertEqual(self.adapter.call_count, 0)
+
+    def test_child_resources(self):
+        """Test that responses to child resources update the rate limit."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text=(
+            '{"issues_url": "mock://api.com/foo/issues"}'
+        ), headers={'X-RateLimit-Remaining': '10'})
+        self.adapter.register_uri('GET', url + '/issues', text='[]', headers={
+            'X-RateLimit-Remaining': '9',
+            'X-RateLimit-Limit': '60',
+        })
+
+        resource = self.client.get(param='foo')
+        self.assertEqual(self.client.rate_limit.remaining, 10)
+        resource.issues.get()
+        self.assertEqual(self.client.rate_limit.remaining, 9)
+        self.assertEqual(self.client.rate_limit.limit, 60)
+
+    def test_refresh_rate_limit(self):
+        client = octokit.Client(api_endpoint='mock://api.com',
+                                session=self.client.session)
+        self.adapter.register_uri('GET', 'mock://api.com/rate_limit', text=(
+            '{"resources": {"core":'
+            ' {"limit": 5000, "remaining": 4999, "reset": 1446804464}},'
+            ' "rate": {"limit": 5000, "remaining": 4999, "reset": 1446804464}}'
+        ))
+
+        rate_limit = client.refresh_rate_limit()
+        self.assertEqual(rate_limit.remaining, 4999)
+        self.assertEqual(rate_limit.resets_at, 1446804464)
+
+        self.adapter.register_uri('GET', 'mock://api.com/rate_limit', text=(
+            '{"resources": {"core":'
+            ' {"limit": 5000, "remaining": 4998, "reset": 1446804464}}}'
+        ))
+        self.assertIs(client.update_rate_limit(), client.rate_limit)
+        self.assertEqual(client.rate_limit.remaining, 4998)
+
 if __name__ == '__main__':
     unittest.main()
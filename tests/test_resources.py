@@ -1,10 +1,15 @@
+import io
 import os
+import shutil
+import tempfile
 import unittest
 
+import requests
 import requests_mock
 import uritemplate
 
 import octokit
+from octokit.retry import RetryPolicy
 
 
 class TestResources(unittest.TestCase):
@@ -50,5 +55,132 @@ class TestResources(unittest.TestCase):
             response = method('foo')
             assert response.success
 
+    def test_lazy_schema(self):
+        """Test that the schema is only built as it is accessed."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text=(
+            '{"issues": [{"number": 1}, {"number": 2}],'
+            ' "owner": {"login": "octocat"},'
+            ' "html_url": "https://github.com/octokit",'
+            ' "blog_url": null}'
+        ))
+
+        response = self.client(param='foo')
+        schema = response.schema
+        self.assertEqual(len(schema._values), 0)
+
+        self.assertEqual(sorted(schema), ['blog', 'html', 'issues', 'owner'])
+        self.assertEqual(response.owner.login, 'octocat')
+        self.assertEqual(response.html.url, 'https://github.com/octokit')
+        self.assertIsNone(response.blog)
+        self.assertNotIn('issues', schema._values)
+
+        issues = response.issues
+        self.assertEqual(len(issues), 2)
+        self.assertEqual(issues[-1].number, 2)
+        self.assertEqual(issues[-1].name, 'Issue')
+        self.assertEqual(issues._items[0], None)
+
+    def test_compact(self):
+        """Test that resources are slotted and drop their response."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text='[{"id": 1}, {"id": 2}]')
+
+        response = self.client(param='foo')
+        self.assertFalse(hasattr(response, '__dict__'))
+        self.assertIsNone(response.response)
+        self.assertIs(response.rels, response.schema[0].rels)
+
+        self.client.session.keep_response = True
+        response = self.client(param='foo')
+        self.assertEqual(response.response.status_code, 200)
+
+    def register_archive(self, body, honor_range=True):
+        """Serve body at mock://api.com/archive, honoring Range headers"""
+        self.ranges = []
+
+        def archive(request, context):
+            self.ranges.append(request.headers.get('Range'))
+            start = 0
+            if honor_range and request.headers.get('Range'):
+                start = int(request.headers['Range'][6:-1])
+                if start >= len(body):
+                    context.status_code = 416
+                    context.headers['Content-Range'] = 'bytes */%d' % len(
+                        body)
+                    return b''
+                context.status_code = 206
+                context.headers['Content-Range'] = 'bytes %d-%d/%d' % (
+                    start, len(body) - 1, len(body))
+            context.headers['Content-Length'] = str(len(body) - start)
+            return body[start:]
+
+        self.adapter.register_uri('GET', 'mock://api.com/archive',
+                                  content=archive)
+
+    def test_iter_bytes(self):
+        """Test that bodies are streamed without being decoded."""
+        body = os.urandom(1000)
+        self.register_archive(body)
+
+        chunks = list(self.client.iter_bytes(param='archive', chunk_size=300))
+        self.assertEqual([len(c) for c in chunks], [300, 300, 300, 100])
+        self.assertEqual(b''.join(chunks), body)
+        self.assertEqual(
+            self.adapter.last_request.headers['Accept-Encoding'], 'identity')
+
+        chunks = self.client.iter_bytes(param='archive', offset=950)
+        self.assertEqual(b''.join(chunks), body[950:])
+        self.assertEqual(self.ranges[-1], 'bytes=950-')
+
+    def test_download(self):
+        """Test downloads with progress and resume."""
+        body = os.urandom(1000)
+        self.register_archive(body)
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'archive.tar.gz')
+        with open(path, 'wb') as f:
+            f.write(body[:600])
+
+        progress = []
+        size = self.client.download(
+            path, param='archive', chunk_size=300, resume=True,
+            progress=lambda done, total: progress.append((done, total)))
+        self.assertEqual(size, 1000)
+        self.assertEqual(progress, [(900, 1000), (1000, 1000)])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), body)
+
+        # Complete already
+        self.assertEqual(self.client.download(path, param='archive',
+                                              resume=True), 1000)
+        # Without resume the file is replaced
+        self.assertEqual(self.client.download(path, param='archive'), 1000)
+        self.assertEqual(self.ranges[-1], None)
+
+    def test_download_range_ignored(self):
+        """Test resuming from servers which ignore Range headers."""
+        body = os.urandom(1000)
+        self.register_archive(body, honor_range=False)
+        f = io.BytesIO(body[:600])
+        f.seek(600)
+
+        self.client.download(f, param='archive', resume=True)
+        self.assertEqual(f.getvalue(), body)
+
+    def test_download_reconnect(self):
+        """Test that failing to connect is retried like a broken transfer."""
+        self.client.session.retry = RetryPolicy(sleep=lambda seconds: None)
+        self.adapter.register_uri('GET', 'mock://api.com/archive', [
+            {'exc': requests.ConnectionError},
+            {'content': b'archive'},
+        ])
+        f = io.BytesIO()
+
+        self.assertEqual(self.client.download(f, param='archive'), 7)
+        self.assertEqual(f.getvalue(), b'archive')
+        self.assertEqual(self.adapter.call_count, 2)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import requests_mock
+import uritemplate
+
+import octokit
+from octokit.retry import RetryPolicy
+
+
+class TestRetry(unittest.TestCase):
+    """Tests the functionality in octokit/retry.py"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.sleeps = []
+        self.retry = RetryPolicy(max_attempts=3, clock=lambda: self.now,
+                                 sleep=self.sleep)
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}',
+                                     retry=self.retry)
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.url = uritemplate.expand(self.client.url, {'param': 'foo'})
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def test_retry_server_errors(self):
+        """Test that transient server errors are retried."""
+        self.adapter.register_uri('GET', self.url, [
+            {'status_code': 502, 'text': '{"message": "Bad Gateway"}'},
+            {'status_code': 503, 'headers': {'Retry-After': '7'}},
+            {'text': '{"success": true}'},
+        ])
+
+        response = self.client.get(param='foo')
+        self.assertTrue(response.success)
+        self.assertEqual(self.adapter.call_count, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertLessEqual(self.sleeps[0], 0.5)
+        self.assertEqual(self.sleeps[1], 7)
+        self.assertEqual(self.retry.metrics, {'retries': 2, 'give_ups': 0})
+
+    def test_give_up(self):
+        """Test that the policy gives up after max_attempts."""
+        self.adapter.register_uri('GET', self.url, status_code=502)
+
+        with self.assertRaises(octokit.exceptions.BadGateway):
+            self.client.get(param='foo')
+        self.assertEqual(self.adapter.call_count, 3)
+        self.assertEqual(self.retry.metrics, {'retries': 2, 'give_ups': 1})
+
+    def test_total_timeout(self):
+        """Test that retries stop when they would exceed the time budget."""
+        self.retry.total_timeout = 60
+        self.adapter.register_uri('GET', self.url, status_code=503,
+                                  headers={'Retry-After': '120'})
+
+        with self.assertRaises(octokit.exceptions.ServiceUnavailable):
+            self.client.get(param='foo')
+        self.assertEqual(self.adapter.call_count, 1)
+
+    def test_secondary_rate_limit(self):
+        self.adapter.register_uri('GET', self.url, [
+            {'status_code': 403, 'text': (
+                '{"message": "You have exceeded a secondary rate limit."}'
+            )},
+            {'text': '{"success": true}'},
+        ])
+
+        self.assertTrue(self.client.get(param='foo').success)
+        self.assertEqual(self.retry.retries, 1)
+
+    def test_not_retried(self):
+        """Test that client errors and non idempotent methods fail at once."""
+        self.adapter.register_uri('GET', self.url, status_code=404)
+        self.adapter.register_uri('POST', self.url, status_code=502)
+
+        with self.assertRaises(octokit.exceptions.NotFound):
+            self.client.get(param='foo')
+        with self.assertRaises(octokit.exceptions.BadGateway):
+            self.client.post(param='foo')
+        self.assertEqual(self.adapter.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.root import ROOT_LINKS
+
+
+class TestRoot(unittest.TestCase):
+    """Tests the functionality in octokit/root.py"""
+
+    def setUp(self):
+        self.adapter = requests_mock.Adapter()
+        self.adapter.register_uri('GET', 'https://api.github.com/users/octocat',
+                                  text='{"login": "octocat"}')
+        self.adapter.register_uri('GET', 'https://api.github.com', text=(
+            '{"user_url": "https://api.github.com/users/{user}"}'))
+
+    def client(self, **kwargs):
+        client = octokit.Client(**kwargs)
+        client.session.mount('https://', self.adapter)
+        return client
+
+    def test_snapshot(self):
+        """Test that clients of api.github.com don't request the root."""
+        client = self.client()
+
+        self.assertEqual(client.user('octocat')['login'], 'octocat')
+        self.assertEqual(self.adapter.call_count, 1)
+
+    def test_discovery(self):
+        """Test that the root is requested without a link map."""
+        client = self.client(root_links=False)
+
+        self.assertEqual(client.user('octocat')['login'], 'octocat')
+        self.assertEqual(self.adapter.call_count, 2)
+
+    def test_refresh(self):
+        """Test that the refreshed link map replaces the bundled one."""
+        client = self.client()
+
+        links = client.refresh_root()
+        self.assertEqual(links, {
+            'user_url': 'https://api.github.com/users/{user}',
+        })
+        self.assertEqual(client.root_links, links)
+        self.assertNotIn('current_user', client.schema)
+        self.assertIn('current_user_url', ROOT_LINKS)
+
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     'modules are imported eagerly before Python 3.7')
+    def test_lazy_import(self):
+        """Test that importing octokit doesn't import its modules."""
+        code = ('import sys, octokit; '
+                'print(sorted(m for m in sys.modules if "octokit." in m)); '
+                'octokit.Client; print("octokit.client" in sys.modules)')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         cwd=root)
+        self.assertEqual(output.decode().split(), ['[]', 'True'])
+
+if __name__ == '__main__':
+    unittest.main()
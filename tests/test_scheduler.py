@@ -0,0 +1,82 @@
+import unittest
+
+import requests_mock
+import uritemplate
+
+import octokit
+from octokit.scheduler import RateLimitScheduler
+
+
+class TestScheduler(unittest.TestCase):
+    """Tests the functionality in octokit/scheduler.py"""
+
+    def setUp(self):
+        self.now = 1000.0
+        self.sleeps = []
+        self.scheduler = RateLimitScheduler(clock=lambda: self.now,
+                                            sleep=self.sleep)
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}',
+                                     scheduler=self.scheduler)
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.url = uritemplate.expand(self.client.url, {'param': 'foo'})
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def test_pacing(self):
+        """Test that requests are spread over the rate limit window."""
+        self.adapter.register_uri('GET', self.url, text='{}', headers={
+            'X-RateLimit-Remaining': '10',
+            'X-RateLimit-Reset': '1100',
+        })
+
+        for _ in range(3):
+            self.client.get(param='foo')
+
+        # the first request is free, then one every 100s / 10 requests
+        self.assertEqual(self.sleeps, [10.0])
+
+    def test_wait_for_reset(self):
+        """Test that an exhausted rate limit waits for the reset."""
+        self.adapter.register_uri('GET', self.url, text='{}', headers={
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': '1100',
+        })
+
+        self.client.get(param='foo')
+        self.client.get(param='foo')
+        self.assertEqual(self.sleeps, [100.0])
+
+    def test_retry_after(self):
+        """Test that secondary rate limits are waited out."""
+        self.adapter.register_uri('GET', self.url, status_code=403,
+                                  headers={'Retry-After': '30'},
+                                  text='{"message": "secondary rate limit"}')
+
+        with self.assertRaises(octokit.exceptions.Unauthorized):
+            self.client.get(param='foo')
+
+        self.scheduler.acquire('')
+        self.assertEqual(self.sleeps, [30.0])
+
+    def test_retry_after_date(self):
+        """Test that a Retry-After date falls back to the reset rather than
+        hide the response."""
+        self.adapter.register_uri('GET', self.url, status_code=429,
+                                  headers={
+                                      'Retry-After':
+                                          'Wed, 21 Oct 2015 07:28:00 GMT',
+                                      'X-RateLimit-Reset': '1100',
+                                  },
+                                  text='{"message": "secondary rate limit"}')
+
+        with self.assertRaises(octokit.exceptions.ClientError):
+            self.client.get(param='foo')
+
+        self.scheduler.acquire('')
+        self.assertEqual(self.sleeps, [100.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.session import ConnectionPool
+
+
+class TestSession(unittest.TestCase):
+    """Tests the functionality in octokit/session.py"""
+
+    def test_session_per_client(self):
+        """Test that clients don't share sessions or hooks by default."""
+        first = octokit.Client(auth=('first', 'token'))
+        second = octokit.Client(auth=('second', 'token'))
+
+        self.assertIsNot(first.session, second.session)
+        self.assertEqual(first.session.auth, ('first', 'token'))
+        self.assertEqual(first.session.hooks['response'],
+                         [first.response_callback])
+
+    def test_shared_pool(self):
+        """Test that clients sharing a pool send through the same adapter."""
+        pool = ConnectionPool(maxsize=20, max_retries=3, backoff_factor=0.5)
+        first = octokit.Client(pool=pool, auth=('first', 'token'))
+        second = octokit.Client(pool=pool, auth=('second', 'token'))
+
+        adapter = first.session.get_adapter('https://api.github.com')
+        self.assertIs(adapter, pool.adapter)
+        self.assertIs(second.session.get_adapter('https://x.com'), adapter)
+        self.assertEqual(adapter._pool_maxsize, 20)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertIsNot(first.session, second.session)
+
+    def test_hooks_per_client(self):
+        """Test that each client's responses reach its own hooks."""
+        first = octokit.Client(api_endpoint='mock://api.com/first')
+        second = octokit.Client(api_endpoint='mock://api.com/second')
+        for client in (first, second):
+            adapter = requests_mock.Adapter()
+            adapter.register_uri('GET', client.url, text='{}',
+                                 headers={'X-RateLimit-Remaining': '1'})
+            client.session.mount('mock', adapter)
+
+        first.get()
+        self.assertEqual(first.rate_limit.remaining, 1)
+        self.assertIsNone(second.last_response)
+
+    def test_keep_alive(self):
+        pool = ConnectionPool(keep_alive=False)
+        self.assertEqual(pool.session().headers['Connection'], 'close')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests
+import requests_mock
+
+import octokit
+from octokit.store import ResponseStore, StoreEntry
+
+
+class TestStore(unittest.TestCase):
+    """Tests the functionality in octokit/store.py"""
+
+    def setUp(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.path = os.path.join(tmpdir, 'store.db')
+
+        self.now = 1000.0
+        self.store = self.open_store()
+        self.adapter = requests_mock.Adapter()
+        self.client = self.open_client(self.store)
+
+    def open_store(self, **kwargs):
+        store = ResponseStore(self.path, clock=lambda: self.now, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def open_client(self, store):
+        client = octokit.Client(api_endpoint='mock://api.com/repo',
+                                session=requests.Session(), cache=store)
+        client.session.mount('mock', self.adapter)
+        return client
+
+    def register_responses(self):
+        headers = {
+            'ETag': '"abc"',
+            'Link': '<mock://api.com/repo?page=2>; rel="next"',
+        }
+        self.adapter.register_uri('GET', self.client.url, [
+            {'text': '{"name": "octokit.py"}', 'headers': headers},
+            {'status_code': 304, 'headers': {'ETag': '"abc"'}},
+        ])
+
+    def test_fresh(self):
+        """Test that fresh responses are served without a request, even by
+        a new store on the same database."""
+        self.register_responses()
+        self.client.get()
+
+        client = self.open_client(self.open_store())
+        response = client.get()
+        self.assertEqual(self.adapter.call_count, 1)
+        self.assertEqual(response['name'], 'octokit.py')
+        self.assertIn('next', response.rels)
+        self.assertTrue(client.last_response.from_cache)
+        self.assertEqual(client.last_response.json(), {'name': 'octokit.py'})
+
+    def test_revalidate(self):
+        """Test that stale responses are revalidated and renewed."""
+        self.register_responses()
+        self.client.get()
+
+        self.now += 61
+        response = self.client.get()
+        self.assertEqual(self.adapter.call_count, 2)
+        self.assertEqual(self.adapter.last_request.headers['If-None-Match'],
+                         '"abc"')
+        self.assertEqual(response['name'], 'octokit.py')
+
+        self.client.get()
+        self.assertEqual(self.adapter.call_count, 2)
+
+    def test_revalidate_reads_once(self):
+        """Test that a stale entry is read once to be revalidated."""
+        self.register_responses()
+        self.client.get()
+
+        reads = []
+        get = self.store.get
+        self.store.get = lambda key: reads.append(key) or get(key)
+        self.now += 61
+        self.client.get()
+        self.assertEqual(len(reads), 1)
+
+    def test_accessed_index(self):
+        """Test that the access order is indexed rather than scanned."""
+        plan = self.store._db.execute(
+            'EXPLAIN QUERY PLAN SELECT MAX(accessed) FROM store').fetchall()
+        self.assertIn('store_accessed', str(plan))
+
+    def test_eviction(self):
+        """Test that the least recently used responses are evicted."""
+        store = self.open_store(max_bytes=100)
+        for key in 'ab':
+            store.set(key, StoreEntry(data='x' * 40))
+        store.get('a')
+        store.set('c', StoreEntry(data='x' * 40))
+
+        self.assertIsNone(store.get('b'))
+        self.assertEqual(store.get('a').data, 'x' * 40)
+        self.assertEqual(store.get('c').data, 'x' * 40)
+        self.assertLessEqual(store.size, 100)
+
+if __name__ == '__main__':
+    unittest.main()
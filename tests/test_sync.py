@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.sync import FileStateStore, IncrementalSync, SQLiteStateStore
+
+
+class TestSync(unittest.TestCase):
+    """Tests the functionality in octokit/sync.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='http://api.test/issues')
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('http://', self.adapter)
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def register(self, *responses):
+        self.adapter.register_uri('GET', self.client.url, list(responses))
+
+    def sync(self, store):
+        return [i['number'] for i in IncrementalSync(self.client, store)]
+
+    def check_runs(self, store):
+        self.register(
+            {'json': [
+                {'id': 1, 'number': 1, 'updated_at': '2015-11-01T00:00:00Z'},
+                {'id': 2, 'number': 2, 'updated_at': '2015-11-02T00:00:00Z'},
+            ], 'headers': {'ETag': '"first"'}},
+            {'json': [
+                {'id': 2, 'number': 2, 'updated_at': '2015-11-02T00:00:00Z'},
+                {'id': 3, 'number': 3, 'updated_at': '2015-11-02T00:00:00Z'},
+            ], 'headers': {'ETag': '"second"'}},
+            {'json': [
+                {'id': 2, 'number': 2, 'updated_at': '2015-11-02T00:00:00Z'},
+                {'id': 3, 'number': 3, 'updated_at': '2015-11-02T00:00:00Z'},
+            ], 'headers': {'ETag': '"second"'}},
+            {'status_code': 304},
+        )
+
+        self.assertEqual(self.sync(store), [1, 2])
+        self.assertNotIn('If-None-Match', self.adapter.last_request.headers)
+
+        # issue 2 was seen at the high-water mark already
+        self.assertEqual(self.sync(store), [3])
+        self.assertEqual(self.adapter.last_request.qs['since'],
+                         ['2015-11-02t00:00:00z'])
+
+        # no change, the ETag is remembered for the next run
+        self.assertEqual(self.sync(store), [])
+        self.assertEqual(self.sync(store), [])
+        self.assertEqual(self.adapter.last_request.headers['If-None-Match'],
+                         '"second"')
+        self.assertEqual(self.adapter.call_count, 4)
+
+    def test_file_store(self):
+        self.check_runs(FileStateStore(os.path.join(self.tmpdir, 's.json')))
+
+    def test_sqlite_store(self):
+        store = SQLiteStateStore(os.path.join(self.tmpdir, 's.db'))
+        self.addCleanup(store.close)
+        self.check_runs(store)
+
+    def test_multiple_pages(self):
+        """Test that the ETag is not relied upon when the listing spans more
+        than its first page, whose ETag doesn't change with the others."""
+        store = FileStateStore(os.path.join(self.tmpdir, 's.json'))
+        next_url = self.client.url + '?page=2'
+        first = {'json': [
+            {'id': 1, 'number': 1, 'updated_at': '2015-11-01T00:00:00Z'},
+        ], 'headers': {'ETag': '"first"',
+                       'Link': '<%s>; rel="next"' % next_url}}
+        self.register(first, first, first)
+        self.adapter.register_uri('GET', next_url, [
+            {'json': [{'id': 2, 'number': 2,
+                       'updated_at': '2015-10-01T00:00:00Z'}]},
+            {'json': [{'id': 2, 'number': 2,
+                       'updated_at': '2015-10-01T00:00:00Z'}]},
+            {'json': [{'id': 2, 'number': 2,
+                       'updated_at': '2015-11-03T00:00:00Z'}]},
+        ])
+
+        sync = lambda: [i['number'] for i in
+                        IncrementalSync(self.client, store, since_param=None)]
+        self.assertEqual(sync(), [1, 2])
+        self.assertEqual(sync(), [])
+        self.assertEqual(sync(), [2])
+        for request in self.adapter.request_history:
+            self.assertNotIn('If-None-Match', request.headers)
+
+    def test_first_page_error(self):
+        """Test that the client's hooks still run on the first page."""
+        store = FileStateStore(os.path.join(self.tmpdir, 's.json'))
+        self.register({'status_code': 500,
+                       'json': {'message': 'Server Error'},
+                       'headers': {'X-RateLimit-Remaining': '42'}})
+
+        with self.assertRaises(octokit.exceptions.InternalServerError):
+            self.sync(store)
+        self.assertEqual(self.client.rate_limit.remaining, 42)
+        self.assertIsNone(store.load(IncrementalSync(self.client, store).key))
+
+    def test_interrupted_run(self):
+        """Test that the state is only saved once a run completes."""
+        store = FileStateStore(os.path.join(self.tmpdir, 's.json'))
+        self.register({'json': [
+            {'id': 1, 'number': 1, 'updated_at': '2015-11-01T00:00:00Z'},
+            {'id': 2, 'number': 2, 'updated_at': '2015-11-02T00:00:00Z'},
+        ]})
+
+        for issue in IncrementalSync(self.client, store):
+            break
+        self.assertEqual(self.sync(store), [1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
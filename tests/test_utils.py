@@ -0,0 +1,30 @@
+import unittest
+
+import requests
+
+from octokit.utils import auth_identity, compile_template
+
+
+class TestUtils(unittest.TestCase):
+    """Tests the functionality in octokit/utils.py"""
+
+    def test_compile_template(self):
+        url = 'https://api.github.com/repos{/owner}{/repo}'
+        template = compile_template(url)
+
+        self.assertIs(compile_template(url), template)
+        self.assertEqual(template.variable_names, set(['owner', 'repo']))
+        self.assertEqual(template.expand({'owner': 'octokit'}),
+                         'https://api.github.com/repos/octokit')
+
+    def test_auth_identity(self):
+        anonymous = requests.Request('GET', 'https://api.github.com')
+        token = requests.Request('GET', 'https://api.github.com',
+                                 auth=('login', 'token'))
+
+        self.assertEqual(auth_identity(anonymous.prepare()), '')
+        self.assertNotIn('token', auth_identity(token.prepare()))
+        self.assertNotEqual(auth_identity(token.prepare()), '')
+
+if __name__ == '__main__':
+    unittest.main()